@@ -3,7 +3,8 @@ Camera Agent - Individual camera agent for wildlife and wildfire detection
 """
 
 from typing import Dict, Any, Optional, List
-from datetime import datetime
+from collections import deque
+from types import MappingProxyType
 import uuid
 import os
 
@@ -19,6 +20,76 @@ except (ImportError, ModuleNotFoundError):
     cv2 = None
     np = None
 
+# Torch is used for pinned (page-locked) frame buffers on the GPU path -
+# optional, only when CUDA is actually available
+try:
+    import torch
+    CUDA_AVAILABLE = torch.cuda.is_available()
+except (ImportError, ModuleNotFoundError):
+    torch = None
+    CUDA_AVAILABLE = False
+
+# Activity detail lookup - built once and shared (read-only) across all
+# agents instead of reconstructing the nested dicts per detection
+_ACTIVITY_DETAILS = MappingProxyType({
+    "wildfire": MappingProxyType({
+        "description": "Wildfire detected - fire and/or smoke visible",
+        "severity": "critical",
+        "action_required": True
+    }),
+    "wildlife_detected": MappingProxyType({
+        "description": "Wildlife detected in area",
+        "severity": "medium",
+        "action_required": False
+    }),
+    "wildlife_bear": MappingProxyType({
+        "description": "Bear detected in area",
+        "severity": "high",
+        "action_required": True
+    }),
+    "wildlife_coyote": MappingProxyType({
+        "description": "Coyote detected in area",
+        "severity": "high",
+        "action_required": True
+    }),
+    "wildlife_deer": MappingProxyType({
+        "description": "Deer detected in area",
+        "severity": "low",
+        "action_required": False
+    }),
+    "wildlife_bird": MappingProxyType({
+        "description": "Bird detected",
+        "severity": "low",
+        "action_required": False
+    }),
+    "wildlife_cat": MappingProxyType({
+        "description": "Cat detected",
+        "severity": "low",
+        "action_required": False
+    }),
+    "wildlife_dog": MappingProxyType({
+        "description": "Dog detected",
+        "severity": "low",
+        "action_required": False
+    }),
+    "wildlife_horse": MappingProxyType({
+        "description": "Horse detected",
+        "severity": "low",
+        "action_required": False
+    }),
+    "lost_pet": MappingProxyType({
+        "description": "Lost pet detected - no owner nearby, moving across area",
+        "severity": "medium",
+        "action_required": True
+    })
+})
+
+_UNKNOWN_ACTIVITY = MappingProxyType({
+    "description": "Wildlife or wildfire activity detected",
+    "severity": "low",
+    "action_required": False
+})
+
 class CameraAgent:
     """Individual camera agent that processes video feeds"""
     
@@ -28,10 +99,20 @@ class CameraAgent:
         self.coordinator = coordinator
         self.status = "active"
         self.last_detection = None
-        self.reasoning_log: List[Dict[str, Any]] = []
+        # Bounded: only the last 10 entries are ever served, so evict
+        # automatically instead of growing forever
+        self.reasoning_log: deque = deque(maxlen=10)
         self.use_real_ai = use_real_ai and AI_AVAILABLE
         self.video_analyzer = VideoAnalyzer() if (self.use_real_ai and VideoAnalyzer) else None
         self.previous_frame = None
+        # Ping-pong frame buffers - reused across frames to avoid a full
+        # frame allocation + copy per frame (see _process_frame_real_ai)
+        self._prev_buf = None
+        self._cur_buf = None
+        # Pinned host buffer for the GPU path (page-locked memory makes the
+        # host-to-device upload inside YOLO/torch roughly 2x faster)
+        self._pinned_tensor = None
+        self._pinned_view = None
     
     def process_frame(self, frame_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Process a video frame and detect threats"""
@@ -42,20 +123,27 @@ class CameraAgent:
             # Simulated mode: return None (scenarios will trigger detections)
             return None
     
-    def _process_frame_real_ai(self, frame_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def enqueue_frame(self, frame_data: 'np.ndarray'):
+        """Queue a frame for batched processing via the coordinator"""
+        self.coordinator.enqueue_frame(self.camera_id, frame_data)
+
+    def _process_frame_real_ai(self, frame_data: Dict[str, Any], detected_objects: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
         """Process frame using real AI/computer vision"""
         if not self.video_analyzer or not np:
             return None
-        
+
         # frame_data can be a numpy array (OpenCV frame) or path to video
         if isinstance(frame_data, np.ndarray):
-            # Direct frame analysis
+            # Direct frame analysis - stage through pinned memory when the
+            # analyzer will upload to CUDA
+            frame = self._stage_frame(frame_data)
             detection = self.video_analyzer.process_live_frame(
-                frame_data, 
+                frame,
                 self.camera_id,
-                self.previous_frame
+                self.previous_frame,
+                detected_objects
             )
-            self.previous_frame = frame_data.copy()
+            self._store_previous_frame(frame_data)
         elif isinstance(frame_data, str) and os.path.exists(frame_data):
             # Video file path - analyze video
             detections = self.video_analyzer.analyze_video_file(
@@ -70,9 +158,59 @@ class CameraAgent:
             self.last_detection = detection
             self._log_reasoning(detection, is_real_ai=True)
             return detection
-        
+
         return None
-    
+
+    def _stage_frame(self, frame_data: 'np.ndarray') -> 'np.ndarray':
+        """
+        Stage a frame for analysis, using a pinned host buffer on the GPU path
+
+        When CUDA is available, frames are copied once into a page-locked
+        torch buffer whose ndarray view is handed to the analyzer, so the
+        model's host-to-device copy runs at pinned-memory bandwidth. Without
+        CUDA the frame is passed through untouched.
+        """
+        if not CUDA_AVAILABLE or frame_data.dtype != np.uint8:
+            return frame_data
+
+        if self._pinned_view is None or self._pinned_view.shape != frame_data.shape:
+            try:
+                self._pinned_tensor = torch.empty(
+                    frame_data.shape, dtype=torch.uint8
+                ).pin_memory()
+                self._pinned_view = self._pinned_tensor.numpy()
+            except Exception:
+                # Pinned allocation can fail under memory pressure - degrade
+                # to the plain pageable path
+                self._pinned_tensor = None
+                self._pinned_view = None
+                return frame_data
+
+        np.copyto(self._pinned_view, frame_data)
+        return self._pinned_view
+
+    def _store_previous_frame(self, frame_data: 'np.ndarray'):
+        """
+        Store the current frame as previous_frame without allocating per frame
+
+        Uses two preallocated ping-pong buffers: copy the frame into the spare
+        buffer, then swap, so each frame costs one copy and zero allocations
+        instead of a fresh ndarray.copy() every call.
+        """
+        if (self._prev_buf is None or
+                self._prev_buf.shape != frame_data.shape or
+                self._prev_buf.dtype != frame_data.dtype or
+                not frame_data.flags.c_contiguous):
+            # First frame, shape change, or non-contiguous input: fall back to a plain copy
+            self._prev_buf = frame_data.copy()
+            self._cur_buf = np.empty_like(frame_data)
+            self.previous_frame = self._prev_buf
+            return
+
+        np.copyto(self._cur_buf, frame_data)
+        self._prev_buf, self._cur_buf = self._cur_buf, self._prev_buf
+        self.previous_frame = self._prev_buf
+
     def analyze_video_file(self, video_path: str) -> List[Dict[str, Any]]:
         """
         Analyze a video file using real AI (if enabled)
@@ -89,7 +227,7 @@ class CameraAgent:
     
     def detect_suspicious_activity(self, activity_type: str, confidence: float = 0.85) -> Dict[str, Any]:
         """Manually trigger a detection (used by scenarios)"""
-        camera = next((c for c in self.coordinator.get_all_cameras() if c["id"] == self.camera_id), None)
+        camera = self.coordinator.get_camera(self.camera_id)
         
         if not camera:
             return None
@@ -99,7 +237,7 @@ class CameraAgent:
             "activity_type": activity_type,
             "confidence": confidence,
             "location": {"lat": camera["lat"], "lng": camera["lng"]},
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": self.coordinator.now_iso(),
             "behavior": activity_type,
             "details": self._get_activity_details(activity_type)
         }
@@ -111,94 +249,46 @@ class CameraAgent:
     
     def _get_activity_details(self, activity_type: str) -> Dict[str, Any]:
         """Get details for activity type"""
-        details_map = {
-            "wildfire": {
-                "description": "Wildfire detected - fire and/or smoke visible",
-                "severity": "critical",
-                "action_required": True
-            },
-            "wildlife_detected": {
-                "description": "Wildlife detected in area",
-                "severity": "medium",
-                "action_required": False
-            },
-            "wildlife_bear": {
-                "description": "Bear detected in area",
-                "severity": "high",
-                "action_required": True
-            },
-            "wildlife_coyote": {
-                "description": "Coyote detected in area",
-                "severity": "high",
-                "action_required": True
-            },
-            "wildlife_deer": {
-                "description": "Deer detected in area",
-                "severity": "low",
-                "action_required": False
-            },
-            "wildlife_bird": {
-                "description": "Bird detected",
-                "severity": "low",
-                "action_required": False
-            },
-            "wildlife_cat": {
-                "description": "Cat detected",
-                "severity": "low",
-                "action_required": False
-            },
-            "wildlife_dog": {
-                "description": "Dog detected",
-                "severity": "low",
-                "action_required": False
-            },
-            "wildlife_horse": {
-                "description": "Horse detected",
-                "severity": "low",
-                "action_required": False
-            },
-            "lost_pet": {
-                "description": "Lost pet detected - no owner nearby, moving across area",
-                "severity": "medium",
-                "action_required": True
-            }
-        }
-        return details_map.get(activity_type, {
-            "description": "Wildlife or wildfire activity detected",
-            "severity": "low",
-            "action_required": False
-        })
-    
+        # Copy to a plain dict at the boundary: detections flow into
+        # json/orjson serialization and threat records downstream, and a
+        # mappingproxy is neither serializable nor safely mutable there
+        return dict(_ACTIVITY_DETAILS.get(activity_type, _UNKNOWN_ACTIVITY))
+
     def _log_reasoning(self, detection: Dict[str, Any], is_real_ai: bool = False):
         """Log AI reasoning for visualization"""
+        # Format the confidence percentage once - it appears in several
+        # strings per entry and the %-format path is not cheap
+        pct_str = f"{int(detection['confidence'] * 100)}%"
+
         if is_real_ai and detection.get('details', {}).get('ai_metrics'):
             # Real AI reasoning with metrics
             metrics = detection['details']['ai_metrics']
+            edge_pct = metrics.get('edge_density', 0) * 100
             reasoning = {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": self.coordinator.now_iso(),
                 "camera_id": self.camera_id,
                 "step": "ai_detection",
-                "reasoning": f"AI analyzed video frame: detected {detection['activity_type']} with {detection['confidence']:.0%} confidence",
+                "reasoning": f"AI analyzed video frame: detected {detection['activity_type']} with {pct_str} confidence",
                 "evidence": [
-                    f"Computer vision analysis completed",
-                    f"Edge density: {metrics.get('edge_density', 0):.2%}",
+                    "Computer vision analysis completed",
+                    f"Edge density: {edge_pct:.2f}%",
                     f"Motion intensity: {metrics.get('motion_intensity', 0):.2f}",
                     f"Detection method: {metrics.get('detection_method', 'unknown')}",
-                    f"Confidence: {detection['confidence']:.0%}"
+                    f"Confidence: {pct_str}"
                 ],
                 "conclusion": f"AI detection identified: {detection['activity_type']}"
             }
         else:
             # Simulated reasoning
             reasoning = {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": self.coordinator.now_iso(),
                 "camera_id": self.camera_id,
                 "step": "detection",
-                "reasoning": f"Detected {detection['activity_type']} with {detection['confidence']:.0%} confidence",
+                "reasoning": f"Detected {detection['activity_type']} with {pct_str} confidence",
                 "evidence": [
                     f"Motion detected at {detection['location']['lat']:.4f}, {detection['location']['lng']:.4f}",
                     f"Behavior pattern matches: {detection['behavior']}",
-                    f"Confidence threshold exceeded: {detection['confidence']:.0%}"
+                    f"Confidence threshold exceeded: {pct_str}"
                 ],
                 "conclusion": f"Detection identified: {detection['activity_type']}"
             }
@@ -208,5 +298,5 @@ class CameraAgent:
     
     def get_reasoning_log(self) -> List[Dict[str, Any]]:
         """Get reasoning log for visualization"""
-        return self.reasoning_log[-10:]  # Last 10 entries
+        return list(self.reasoning_log)  # Last 10 entries (deque maxlen)
 
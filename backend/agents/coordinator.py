@@ -3,10 +3,68 @@ Agent Coordinator - Manages multi-agent coordination via MCP
 """
 
 from typing import List, Dict, Any, Optional
+from collections import deque, OrderedDict
 from datetime import datetime
+import logging
+import logging.handlers
+import math
+from math import cos as _cos, radians as _radians, sqrt as _sqrt
+import queue
+import time
+from time import time as _now
 import uuid
 import asyncio
 
+# NumPy is used to vectorize camera-distance queries - optional dependency
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+
+# orjson for pre-serializing the mostly-static camera payload - optional
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
+# scikit-learn BallTree for sub-linear radius queries on large camera
+# networks - optional dependency
+try:
+    from sklearn.neighbors import BallTree
+    SKLEARN_AVAILABLE = True
+except ImportError:
+    SKLEARN_AVAILABLE = False
+    BallTree = None
+
+# Numba JIT for the Haversine sweep - optional, only pays off on very
+# large camera networks where NumPy temporaries start to matter
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    njit = None
+    prange = None
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, parallel=True, fastmath=True)
+    def _haversine_miles(cam_lat_rad, cam_lng_rad, cam_cos_lat, lat0_rad, lng0_rad, out):
+        """Fill out[i] with the distance in miles from (lat0, lng0) to camera i"""
+        cos_lat0 = math.cos(lat0_rad)
+        for i in prange(cam_lat_rad.shape[0]):
+            dlat = cam_lat_rad[i] - lat0_rad
+            dlng = cam_lng_rad[i] - lng0_rad
+            a = (math.sin(dlat * 0.5) ** 2 +
+                 cos_lat0 * cam_cos_lat[i] *
+                 math.sin(dlng * 0.5) ** 2)
+            out[i] = 2.0 * 3959.0 * math.asin(math.sqrt(a))
+else:
+    _haversine_miles = None
+
 # Import services for emergency calling and community notifications
 try:
     from services.threat_analyzer import ThreatAnalyzer
@@ -19,6 +77,73 @@ except ImportError:
     TwilioService = None
     CommunityNotifier = None
 
+# Non-blocking logger for the async notification paths: records are
+# enqueued and written to stdout by a background listener thread, so the
+# event loop never blocks on a write(2)
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    _log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+    _log_listener = logging.handlers.QueueListener(
+        _log_queue, logging.StreamHandler()
+    )
+    _log_listener.start()
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+def _new_id() -> str:
+    """Cheap unique id - hex form skips the hyphenated UUID string build"""
+    return uuid.uuid4().hex
+
+# Default radius for nearby-camera queries; its latitude box half-width is
+# folded to a constant since virtually every call uses this radius
+_DEFAULT_RADIUS_MILES = 5.0
+_DEFAULT_DLAT_DEG = _DEFAULT_RADIUS_MILES / 69.0
+
+# Emergency call kinds: result key stored on the threat, log label
+_CALL_LABELS = {
+    "police": ("police_call", "Emergency services"),
+    "animal_control": ("animal_control_call", "Animal control"),
+}
+
+class _BoundedIdSet:
+    """
+    Set of recently-seen ids with a size cap (LRU eviction) and a TTL
+
+    Keeps membership checks O(1) while preventing the id set from growing
+    without bound over a long-running service; entries also age out after
+    ttl seconds so the working set stays small and cache-hot.
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 24 * 3600):
+        self._ids: OrderedDict = OrderedDict()  # id -> insertion time
+        self._maxsize = maxsize
+        self._ttl = ttl
+
+    def add(self, item_id: str):
+        now = _now()
+        self._ids[item_id] = now
+        self._ids.move_to_end(item_id)
+        # Evict over-capacity and expired entries from the head (oldest first)
+        while self._ids:
+            oldest_id, oldest_ts = next(iter(self._ids.items()))
+            if len(self._ids) > self._maxsize or now - oldest_ts > self._ttl:
+                self._ids.popitem(last=False)
+            else:
+                break
+
+    def __contains__(self, item_id: str) -> bool:
+        ts = self._ids.get(item_id)
+        if ts is None:
+            return False
+        if _now() - ts > self._ttl:
+            del self._ids[item_id]
+            return False
+        return True
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
 class AgentCoordinator:
     """Coordinates multiple camera agents for wildlife and wildfire detection"""
     
@@ -26,7 +151,9 @@ class AgentCoordinator:
         self.agents: Dict[str, 'CameraAgent'] = {}
         self.threats: List[Dict[str, Any]] = []
         self.patterns: List[Dict[str, Any]] = []
+        self._patterns_by_behavior: Dict[str, List[Dict[str, Any]]] = {}
         self.cameras: List[Dict[str, Any]] = []
+        self._cameras_by_id: Dict[str, Dict[str, Any]] = {}
         self.use_real_ai = use_real_ai
         self._initialize_cameras()
         
@@ -36,10 +163,33 @@ class AgentCoordinator:
         self.community_notifier = CommunityNotifier(self.twilio_service) if SERVICES_AVAILABLE and CommunityNotifier and self.twilio_service else None
         
         # Track which threats have already triggered calls/notifications
-        self.notified_threats: set = set()
+        # (bounded so a long-running service cannot grow it forever)
+        self.notified_threats = _BoundedIdSet(maxsize=10_000)
+
+        # Auxiliary threat data kept out of the threat dicts themselves so
+        # get_active_threats() serves slim records; composed on demand via
+        # get_threat_detail()
+        self._threat_analysis: Dict[str, Dict[str, Any]] = {}
+        self._threat_calls: Dict[str, Dict[str, Any]] = {}
+        self._threat_notifications: Dict[str, Dict[str, Any]] = {}
         
         # Track lost pets across multiple cameras
-        self.lost_pet_tracking: Dict[str, List[Dict[str, Any]]] = {}  # pet_id -> list of detections
+        self.lost_pet_tracking: Dict[str, deque] = {}  # pet_id -> recent detections (bounded)
+
+        # Frames queued for batched AI processing (camera_id, frame)
+        self._pending_frames: List[tuple] = []
+
+        # Cached ISO timestamp shared across agents within a ~50ms window
+        self._now_iso_ns = 0
+        self._now_iso_cache = ""
+
+        # Single background worker that processes threat responses so
+        # add_threat never blocks or spawns per-threat threads
+        self._threat_queue: Optional[asyncio.Queue] = None
+        self._worker_loop = None
+        # Guards the notified_threats check-and-set now that responses run
+        # concurrently (created lazily - __init__ may run without a loop)
+        self._notified_lock: Optional[asyncio.Lock] = None
     
     def _initialize_cameras(self):
         """Initialize demo camera network"""
@@ -52,34 +202,173 @@ class AgentCoordinator:
             {"id": "cam_005", "lat": 37.7757, "lng": -122.4192, "address": "654 Cedar Rd", "status": "active", "video": "cam_005.mp4"},
         ]
         
+        # Build each camera dict directly (fixed schema) rather than
+        # splatting cam_data into a fresh dict and rehashing every key
         for cam_data in camera_locations:
             self.cameras.append({
-                **cam_data,
+                "id": cam_data["id"],
+                "lat": cam_data["lat"],
+                "lng": cam_data["lng"],
+                "address": cam_data["address"],
+                "status": cam_data["status"],
+                "video": cam_data["video"],
                 "last_activity": None,
                 "detections": [],
-                "video_url": f"http://localhost:8000/videos/{cam_data['video']}" if cam_data.get('video') else None
+                "video_url": f"http://localhost:8000/videos/{cam_data['video']}"
             })
+            self._cameras_by_id[cam_data["id"]] = self.cameras[-1]
+
+        # Immutable view handed to callers - avoids exposing the mutable
+        # list and is slightly faster to iterate
+        self._cameras_view = tuple(self.cameras)
+        # Serialized-camera cache, built on first request (invalidated here
+        # if the camera set is ever rebuilt)
+        self._cameras_json_cache: Optional[bytes] = None
+
+        self._rebuild_camera_arrays()
+
+    def _rebuild_camera_arrays(self):
+        """Build SoA lat/lng arrays (radians) for vectorized distance queries"""
+        if not NUMPY_AVAILABLE:
+            self._cam_lat_rad = None
+            self._cam_lng_rad = None
+            self._cam_lat_deg = None
+            self._cam_lng_deg = None
+            self._cam_dist_buf = None
+            self._cam_tree = None
+            return
+
+        count = len(self.cameras)
+        self._cam_lat_deg = np.fromiter(
+            (c.get("lat") or 0.0 for c in self.cameras), dtype=np.float64, count=count)
+        self._cam_lng_deg = np.fromiter(
+            (c.get("lng") or 0.0 for c in self.cameras), dtype=np.float64, count=count)
+        self._cam_lat_rad = np.radians(self._cam_lat_deg)
+        self._cam_lng_rad = np.radians(self._cam_lng_deg)
+        # cos(lat) is loop-invariant per camera - computed once here instead
+        # of once per camera per query
+        self._cam_cos_lat = np.cos(self._cam_lat_rad)
+
+        # BallTree gives O(log N) radius queries; built once here, never
+        # per query (rebuild if the camera set ever changes)
+        self._cam_tree = None
+        if SKLEARN_AVAILABLE and count > 0:
+            self._cam_tree = BallTree(
+                np.column_stack((self._cam_lat_rad, self._cam_lng_rad)),
+                metric="haversine"
+            )
+        # Reusable output buffer for the JIT-compiled distance sweep
+        self._cam_dist_buf = np.empty(len(self.cameras), dtype=np.float64)
     
     def register_agent(self, agent: 'CameraAgent'):
         """Register a new agent"""
         self.agents[agent.agent_id] = agent
+
+    def enqueue_frame(self, camera_id: str, frame):
+        """Queue a camera frame for batched AI processing"""
+        self._pending_frames.append((camera_id, frame))
+
+    def flush_frame_batch(self) -> List[Dict[str, Any]]:
+        """
+        Process all queued frames in one batch
+
+        Object detection runs once over the whole batch (one model call
+        instead of one per camera), then each frame goes through its own
+        agent's pipeline so per-camera temporal state stays correct.
+        """
+        pending, self._pending_frames = self._pending_frames, []
+        if not pending:
+            return []
+
+        agents = [self.agents.get(f"agent_{cam_id}") for cam_id, _ in pending]
+
+        # Batched object detection via the first real-AI analyzer available
+        batch_objects = None
+        analyzer = next((a.video_analyzer for a in agents if a and a.video_analyzer), None)
+        if analyzer and analyzer.yolo_model and len(pending) > 1:
+            batch_objects = analyzer._detect_objects_batch([frame for _, frame in pending])
+
+        detections = []
+        for i, (cam_id, frame) in enumerate(pending):
+            agent = agents[i]
+            if not agent:
+                continue
+            detection = agent._process_frame_real_ai(
+                frame, batch_objects[i] if batch_objects else None
+            )
+            if detection:
+                detections.append(detection)
+        return detections
     
     def get_agent_count(self) -> int:
         """Get total number of registered agents"""
         return len(self.agents)
     
-    def get_all_cameras(self) -> List[Dict[str, Any]]:
-        """Get all camera locations"""
-        return self.cameras
+    def get_all_cameras(self) -> tuple:
+        """Get all camera locations (read-only view)"""
+        return self._cameras_view
+
+    def get_camera(self, camera_id: str) -> Optional[Dict[str, Any]]:
+        """Get a single camera by id (O(1) dict lookup)"""
+        return self._cameras_by_id.get(camera_id)
+
+    def now_iso(self) -> str:
+        """
+        Current ISO timestamp, cached for ~50ms
+
+        Timestamp producers across agents share one formatted string per
+        window instead of paying datetime.now().isoformat() per event.
+        """
+        now_ns = time.monotonic_ns()
+        if now_ns - self._now_iso_ns > 50_000_000:
+            self._now_iso_cache = datetime.now().isoformat()
+            self._now_iso_ns = now_ns
+        return self._now_iso_cache
     
-    def get_active_threats(self) -> List[Dict[str, Any]]:
-        """Get all active threats"""
-        return self.threats
+    def get_active_threats(self) -> tuple:
+        """Get all active threats (snapshot - callers cannot mutate the list)"""
+        return tuple(self.threats)
+
+    def get_all_cameras_json(self) -> Optional[bytes]:
+        """
+        Pre-serialized {"cameras": [...], "count": N} payload
+
+        The camera list is static, so the JSON body is built once (orjson)
+        and handed out as bytes; returns None when orjson is unavailable so
+        callers fall back to normal serialization.
+        """
+        if not ORJSON_AVAILABLE:
+            return None
+        if self._cameras_json_cache is None:
+            self._cameras_json_cache = orjson.dumps(
+                {"cameras": self.cameras, "count": len(self.cameras)}
+            )
+        return self._cameras_json_cache
     
+    def get_threat_analysis(self, threat_id: str) -> Optional[Dict[str, Any]]:
+        """Get the stored analysis for a threat, if it has been processed"""
+        return self._threat_analysis.get(threat_id)
+
+    def get_threat_detail(self, threat_id: str) -> Optional[Dict[str, Any]]:
+        """Compose the full threat view (analysis, calls, notifications) on demand"""
+        threat = next((t for t in self.threats if t.get("id") == threat_id), None)
+        if not threat:
+            return None
+
+        detail = dict(threat)
+        analysis = self._threat_analysis.get(threat_id)
+        if analysis:
+            detail["analysis"] = analysis
+        detail.update(self._threat_calls.get(threat_id, {}))
+        notification = self._threat_notifications.get(threat_id)
+        if notification:
+            detail["community_notification"] = notification
+        return detail
+
     def add_threat(self, threat: Dict[str, Any]):
         """Add a new threat detection"""
-        threat["id"] = str(uuid.uuid4())
-        threat["timestamp"] = datetime.now().isoformat()
+        threat["id"] = _new_id()
+        threat["timestamp"] = self.now_iso()
         threat["status"] = "active"
         self.threats.append(threat)
         
@@ -87,111 +376,225 @@ class AgentCoordinator:
         if threat.get("type") == "lost_pet":
             self._track_lost_pet(threat)
         
-        # Analyze threat and trigger appropriate responses
-        # Schedule async processing (will be handled by FastAPI event loop)
+        # Analyze threat and trigger appropriate responses via the single
+        # background worker (no per-threat thread or event-loop creation,
+        # and no deprecated get_event_loop() probing)
+        if self._threat_queue is None and self._worker_loop is None:
+            self._ensure_worker()
+        if self._threat_queue is not None:
+            self._threat_queue.put_nowait(threat)
+        elif self._worker_loop is not None:
+            asyncio.run_coroutine_threadsafe(
+                self._process_threat_response(threat), self._worker_loop
+            )
+
+    def _ensure_worker(self):
+        """Start the threat-response worker on first use"""
+        if self._threat_queue is not None or self._worker_loop is not None:
+            return
+
         try:
             loop = asyncio.get_running_loop()
-            # We're in an async context, schedule the task
-            loop.create_task(self._process_threat_response(threat))
         except RuntimeError:
-            # Not in async context - process synchronously but don't block
-            # This is a fallback for non-async contexts
-            try:
-                # Try to get existing loop
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    loop.create_task(self._process_threat_response(threat))
-                else:
-                    # Run in background thread to avoid blocking
-                    import threading
-                    def run_async():
-                        new_loop = asyncio.new_event_loop()
-                        asyncio.set_event_loop(new_loop)
-                        new_loop.run_until_complete(self._process_threat_response(threat))
-                        new_loop.close()
-                    thread = threading.Thread(target=run_async, daemon=True)
-                    thread.start()
-            except:
-                # Last resort: just skip async processing
-                # Threat is still added, just won't trigger calls/notifications
-                pass
-    
+            loop = None
+
+        if loop is not None:
+            # In an async context (FastAPI): one long-lived task draining a queue
+            self._threat_queue = asyncio.Queue()
+            loop.create_task(self._threat_worker())
+        else:
+            # No running loop (scripts/tests): one dedicated loop thread,
+            # reused for every threat instead of a thread per threat
+            import threading
+            self._worker_loop = asyncio.new_event_loop()
+
+            def run_loop():
+                asyncio.set_event_loop(self._worker_loop)
+                self._worker_loop.run_forever()
+
+            threading.Thread(
+                target=run_loop, name="threat-response-loop", daemon=True
+            ).start()
+
+    async def _threat_worker(self):
+        """
+        Drain the threat queue and process responses
+
+        Responses are mostly Twilio round trips, so they run as overlapping
+        tasks (bounded by a semaphore) instead of serializing the queue on
+        each call's network latency.
+        """
+        semaphore = asyncio.Semaphore(8)
+
+        async def process(threat):
+            async with semaphore:
+                try:
+                    await self._process_threat_response(threat)
+                except Exception:
+                    logger.exception("Error processing threat response")
+                finally:
+                    self._threat_queue.task_done()
+
+        while True:
+            threat = await self._threat_queue.get()
+            asyncio.create_task(process(threat))
+
     async def _process_threat_response(self, threat: Dict[str, Any]):
         """Process threat and trigger emergency calls/notifications if needed"""
         if not self.threat_analyzer:
             return
         
-        # Check if we've already processed this threat
+        # Check if we've already processed this threat. The check-and-set
+        # is guarded so two concurrent responses for the same id cannot
+        # both pass and double-dial Twilio.
+        if self._notified_lock is None:
+            self._notified_lock = asyncio.Lock()
+
         threat_id = threat.get("id")
-        if threat_id in self.notified_threats:
-            return
-        
-        # Analyze the threat
-        analysis = self.threat_analyzer.analyze_threat(threat)
-        
-        # Store analysis with threat
-        threat["analysis"] = analysis
-        
-        # Find nearby cameras that may have also detected this
-        nearby_cameras = self._find_nearby_cameras(threat.get("location", {}))
-        
-        # Call emergency services if needed (fire dept for wildfires, wildlife authorities for dangerous wildlife, animal control for lost pets)
-        if analysis.get("should_call_police", False):
-            # For lost pets, call animal control instead of police
-            if analysis.get("category") == "lost_pet":
-                await self._call_animal_control(threat, analysis, nearby_cameras)
-            else:
-                await self._call_police(threat, analysis, nearby_cameras)
+        async with self._notified_lock:
+            if threat_id in self.notified_threats:
+                return
+            # Reserve the id immediately (single check-and-set site) so a
+            # concurrent response for the same threat bails at the check
             self.notified_threats.add(threat_id)
         
-        # Notify community if needed
-        if analysis.get("should_notify_community", False):
-            await self._notify_community(threat, analysis, nearby_cameras)
-            if threat_id not in self.notified_threats:
-                self.notified_threats.add(threat_id)
+        # Analyze the threat off the event-loop thread - the analyzer may
+        # call out to an LLM and must not stall other requests
+        analysis = await asyncio.to_thread(self.threat_analyzer.analyze_threat, threat)
+
+        # Store analysis in the side table (kept out of the threat dict so
+        # the threats list stays slim for API serialization)
+        self._threat_analysis[threat_id] = analysis
+
+        should_call = analysis.get("should_call_police", False)
+        should_notify = analysis.get("should_notify_community", False)
+
+        # Benign detection: nothing to dispatch, skip the spatial search
+        if not should_call and not should_notify:
+            return
+
+        # Find nearby cameras that may have also detected this - only
+        # worth computing when a response is actually going out
+        nearby_cameras = self._find_nearby_cameras(threat.get("location", {}))
+
+        # Emergency call (fire dept for wildfires, wildlife authorities for
+        # dangerous wildlife, animal control for lost pets) and community
+        # notification run concurrently - both are network round trips
+        tasks = []
+        if should_call:
+            kind = "animal_control" if analysis.get("category") == "lost_pet" else "police"
+            tasks.append(self._dispatch_call(threat, analysis, nearby_cameras, kind=kind))
+        if should_notify:
+            tasks.append(self._notify_community(threat, analysis, nearby_cameras))
+
+        await asyncio.gather(*tasks)
     
-    def _find_nearby_cameras(self, location: Dict[str, Any], radius_miles: float = 5.0) -> List[Dict[str, Any]]:
+    def _find_nearby_cameras(self, location: Dict[str, Any], radius_miles: float = _DEFAULT_RADIUS_MILES) -> List[Dict[str, Any]]:
         """Find cameras within radius of incident"""
         if not location.get("lat") or not location.get("lng"):
             return []
-        
+
         nearby = []
         incident_lat = location["lat"]
         incident_lng = location["lng"]
-        
+
+        if NUMPY_AVAILABLE and self._cam_tree is not None:
+            # Sub-linear radius query against the prebuilt BallTree;
+            # angular distances scale back to miles by the Earth radius
+            query = np.array([[math.radians(incident_lat), math.radians(incident_lng)]])
+            idx_arrays, dist_arrays = self._cam_tree.query_radius(
+                query, r=radius_miles / 3959.0, return_distance=True
+            )
+            for idx, angular in zip(idx_arrays[0], dist_arrays[0]):
+                camera = self.cameras[idx]
+                if not camera.get("lat") or not camera.get("lng"):
+                    continue
+                nearby.append({
+                    **camera,
+                    "distance_miles": float(angular * 3959.0)
+                })
+            return nearby
+
+        if NUMPY_AVAILABLE and self._cam_lat_rad is not None:
+            lat_rad = math.radians(incident_lat)
+            lng_rad = math.radians(incident_lng)
+
+            # Cheap bounding-box prefilter: drop cameras that are obviously
+            # outside the radius with subtractions/comparisons before doing
+            # any trig (~69 miles per degree of latitude). The dominant
+            # call shape is the 5-mile default, whose latitude half-width
+            # is a precomputed constant.
+            if radius_miles == _DEFAULT_RADIUS_MILES:
+                dlat_deg = _DEFAULT_DLAT_DEG
+            else:
+                dlat_deg = radius_miles / 69.0
+            dlng_deg = radius_miles / (69.0 * max(math.cos(lat_rad), 1e-6))
+            box = ((np.abs(self._cam_lat_deg - incident_lat) <= dlat_deg) &
+                   (np.abs(self._cam_lng_deg - incident_lng) <= dlng_deg))
+            candidates = np.nonzero(box)[0]
+            if candidates.size == 0:
+                return []
+
+            lat_sub = self._cam_lat_rad[candidates]
+            lng_sub = self._cam_lng_rad[candidates]
+            cos_sub = self._cam_cos_lat[candidates]
+
+            if NUMBA_AVAILABLE:
+                # Fused JIT kernel: no intermediate arrays, writes into a
+                # preallocated buffer
+                distances = self._cam_dist_buf[:candidates.size]
+                _haversine_miles(lat_sub, lng_sub, cos_sub, lat_rad, lng_rad, distances)
+            else:
+                # Vectorized Haversine over the surviving cameras at once -
+                # one NumPy expression instead of a Python trig loop per camera
+                dlat = lat_sub - lat_rad
+                dlng = lng_sub - lng_rad
+                a = (np.sin(dlat * 0.5) ** 2 +
+                     math.cos(lat_rad) * cos_sub *
+                     np.sin(dlng * 0.5) ** 2)
+                distances = 2.0 * 3959.0 * np.arcsin(np.sqrt(a))
+
+            for j in np.where(distances <= radius_miles)[0]:
+                camera = self.cameras[candidates[j]]
+                if not camera.get("lat") or not camera.get("lng"):
+                    continue
+                nearby.append({
+                    **camera,
+                    "distance_miles": float(distances[j])
+                })
+
+            return nearby
+
+        # Scalar fallback when NumPy is not available
         for camera in self.cameras:
             cam_lat = camera.get("lat")
             cam_lng = camera.get("lng")
-            
+
             if not cam_lat or not cam_lng:
                 continue
-            
-            # Simple distance calculation (Haversine would be better but this is fine for demo)
+
             distance = self._calculate_distance(incident_lat, incident_lng, cam_lat, cam_lng)
-            
+
             if distance <= radius_miles:
                 nearby.append({
                     **camera,
                     "distance_miles": distance
                 })
-        
+
         return nearby
-    
+
     def _calculate_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-        """Calculate distance between two points in miles (simplified)"""
-        import math
-        R = 3959.0  # Earth radius in miles
-        lat1_rad = math.radians(lat1)
-        lat2_rad = math.radians(lat2)
-        delta_lat = math.radians(lat2 - lat1)
-        delta_lon = math.radians(lon2 - lon1)
-        
-        a = (math.sin(delta_lat / 2) ** 2 +
-             math.cos(lat1_rad) * math.cos(lat2_rad) *
-             math.sin(delta_lon / 2) ** 2)
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-        
-        return R * c
+        """
+        Calculate distance between two points in miles (simplified)
+
+        Equirectangular approximation: one cos + one sqrt instead of the
+        full Haversine trig ladder. Error is well under 0.1% at the few-mile
+        scales this demo operates at, which is plenty for a radius filter.
+        """
+        phi = _radians((lat1 + lat2) * 0.5)
+        x = _radians(lon2 - lon1) * _cos(phi)
+        y = _radians(lat2 - lat1)
+        return 3959.0 * _sqrt(x * x + y * y)  # 3959 = Earth radius in miles
     
     def _track_lost_pet(self, threat: Dict[str, Any]):
         """Track lost pet across multiple cameras to detect if it's moving across streets"""
@@ -204,8 +607,9 @@ class AgentCoordinator:
         pet_id = f"{pet_type}_{camera_id}"
         
         if pet_id not in self.lost_pet_tracking:
-            self.lost_pet_tracking[pet_id] = []
-        
+            # Bounded to the last 10 detections per pet
+            self.lost_pet_tracking[pet_id] = deque(maxlen=10)
+
         # Add detection
         self.lost_pet_tracking[pet_id].append({
             "camera_id": camera_id,
@@ -214,58 +618,51 @@ class AgentCoordinator:
             "threat_id": threat.get("id")
         })
         
-        # Keep only last 10 detections per pet
-        if len(self.lost_pet_tracking[pet_id]) > 10:
-            self.lost_pet_tracking[pet_id].pop(0)
-        
         # Check if pet has been detected across multiple cameras (indicating movement across streets)
         unique_cameras = set([d["camera_id"] for d in self.lost_pet_tracking[pet_id]])
         if len(unique_cameras) >= 2:
-            # Pet detected across multiple cameras - definitely lost
-            threat["details"]["detected_across_cameras"] = True
-            threat["details"]["camera_count"] = len(unique_cameras)
-            threat["details"]["is_moving_across_streets"] = True
+            # Pet detected across multiple cameras - definitely lost.
+            # Details may be a shared read-only template, so copy before
+            # mutating rather than writing into the shared instance.
+            details = dict(threat.get("details") or {})
+            details["detected_across_cameras"] = True
+            details["camera_count"] = len(unique_cameras)
+            details["is_moving_across_streets"] = True
+            threat["details"] = details
             print(f"Lost pet {pet_type} detected across {len(unique_cameras)} cameras - moving across area")
     
-    async def _call_police(
+    async def _dispatch_call(
         self,
         threat: Dict[str, Any],
         analysis: Dict[str, Any],
-        nearby_cameras: List[Dict[str, Any]]
+        nearby_cameras: List[Dict[str, Any]],
+        kind: str = "police"
     ):
-        """Call emergency services with threat information (fire dept for wildfires, wildlife authorities for dangerous wildlife)"""
-        if not self.twilio_service:
-            print("Twilio service not available - cannot call emergency services")
-            return
-        
-        try:
-            result = self.twilio_service.call_police(threat, analysis, nearby_cameras)
-            if result:
-                threat["police_call"] = result
-                print(f"Emergency services called for threat {threat.get('id')}: {result.get('status')}")
-        except Exception as e:
-            print(f"Error calling emergency services: {e}")
-    
-    async def _call_animal_control(
-        self,
-        threat: Dict[str, Any],
-        analysis: Dict[str, Any],
-        nearby_cameras: List[Dict[str, Any]]
-    ):
-        """Call animal control for lost pet detection"""
+        """
+        Place an emergency call for a threat
+
+        kind selects the responder: "police" covers fire dept for wildfires
+        and wildlife authorities for dangerous wildlife; "animal_control"
+        covers lost pets. Both go through the same Twilio call path, only
+        the stored result key and log label differ.
+        """
+        result_key, label = _CALL_LABELS[kind]
+
         if not self.twilio_service:
-            print("Twilio service not available - cannot call animal control")
+            logger.info("Twilio service not available - cannot call %s", label.lower())
             return
-        
+
         try:
-            # Use the same call_police method but with different messaging
-            result = self.twilio_service.call_police(threat, analysis, nearby_cameras)
+            # call_police is a synchronous Twilio round trip - keep it off
+            # the event loop
+            result = await asyncio.to_thread(
+                self.twilio_service.call_police, threat, analysis, nearby_cameras
+            )
             if result:
-                threat["animal_control_call"] = result
-                pet_type = threat.get("details", {}).get("pet_type", "pet")
-                print(f"Animal control called for lost {pet_type} {threat.get('id')}: {result.get('status')}")
+                self._threat_calls[threat.get("id")] = {result_key: result}
+                logger.info("%s called for threat %s: %s", label, threat.get('id'), result.get('status'))
         except Exception as e:
-            print(f"Error calling animal control: {e}")
+            logger.exception("Error calling %s", label.lower())
     
     async def _notify_community(
         self,
@@ -275,37 +672,56 @@ class AgentCoordinator:
     ):
         """Notify community members about the threat"""
         if not self.community_notifier:
-            print("Community notifier not available - cannot send notifications")
+            logger.info("Community notifier not available - cannot send notifications")
             return
         
         try:
-            result = self.community_notifier.notify_community(threat, analysis, nearby_cameras)
+            # notify_community sends SMS synchronously - keep it off the
+            # event loop
+            result = await asyncio.to_thread(
+                self.community_notifier.notify_community, threat, analysis, nearby_cameras
+            )
             if result:
-                threat["community_notification"] = result
-                print(f"Community notified for threat {threat.get('id')}: {result.get('notified_count')} members")
-        except Exception as e:
-            print(f"Error notifying community: {e}")
+                self._threat_notifications[threat.get("id")] = result
+                logger.info("Community notified for threat %s: %s members", threat.get('id'), result.get('notified_count'))
+        except Exception:
+            logger.exception("Error notifying community")
     
     def correlate_pattern(self, detection: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Correlate detection with existing patterns"""
-        # Simple pattern matching: same behavior across multiple cameras
-        for pattern in self.patterns:
-            if (pattern.get("behavior") == detection.get("behavior") and
-                abs(pattern.get("timestamp", 0) - datetime.now().timestamp()) < 3600):
-                pattern["occurrences"].append(detection)
+        # Patterns are indexed by behavior so matching is a dict lookup
+        # instead of a linear scan over every pattern ever created
+        behavior = detection.get("behavior")
+        now = _now()
+
+        candidates = self._patterns_by_behavior.get(behavior)
+        if candidates:
+            # Drop expired patterns from the head (oldest first)
+            while candidates and now - candidates[0].get("timestamp", 0) >= 3600:
+                candidates.pop(0)
+            if candidates:
+                pattern = candidates[0]
+                occurrences = pattern["occurrences"]
+                occurrences.append(detection)
+                # Cap stored occurrences; count keeps the full total
+                # (stays a plain list so patterns remain JSON-serializable
+                # for the WebSocket broadcasts)
+                if len(occurrences) > 64:
+                    del occurrences[0]
                 pattern["count"] += 1
                 return pattern
-        
+
         # Create new pattern
         new_pattern = {
-            "id": str(uuid.uuid4()),
-            "behavior": detection.get("behavior"),
+            "id": _new_id(),
+            "behavior": behavior,
             "occurrences": [detection],
             "count": 1,
-            "timestamp": datetime.now().timestamp(),
+            "timestamp": now,
             "predicted_next": None
         }
         self.patterns.append(new_pattern)
+        self._patterns_by_behavior.setdefault(behavior, []).append(new_pattern)
         return new_pattern
     
     def predict_next_target(self, pattern: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -316,20 +732,57 @@ class AgentCoordinator:
         # Simple prediction: extrapolate from movement pattern
         occurrences = pattern["occurrences"]
         if len(occurrences) >= 2:
-            # Calculate direction of movement
             last = occurrences[-1]
-            prev = occurrences[-2]
-            
-            # Find nearest camera in predicted direction
+
+            # Build the seen set once - O(1) membership instead of
+            # rebuilding a camera-id list for every candidate camera
+            seen = {o["camera_id"] for o in occurrences}
+
+            # Find the nearest unseen camera to the latest occurrence
             # This is simplified - real implementation would use more sophisticated algorithms
+            last_location = last.get("location", {})
+
+            if (self._cam_tree is not None and
+                    last_location.get("lat") and last_location.get("lng")):
+                # BallTree returns neighbors sorted by distance, so the
+                # first unseen hit is the nearest unseen camera
+                query = np.array([[math.radians(last_location["lat"]),
+                                   math.radians(last_location["lng"])]])
+                _, idx = self._cam_tree.query(query, k=len(self.cameras))
+                for i in idx[0]:
+                    camera = self.cameras[i]
+                    if camera["id"] not in seen:
+                        return {
+                            "camera_id": camera["id"],
+                            "location": {"lat": camera["lat"], "lng": camera["lng"]},
+                            "confidence": min(0.9, 0.5 + (pattern["count"] * 0.1)),
+                            "reasoning": f"Pattern detected: {pattern['count']} similar incidents"
+                        }
+                return None
+
+            best_camera = None
+            best_distance = None
             for camera in self.cameras:
-                if camera["id"] not in [o["camera_id"] for o in occurrences]:
-                    return {
-                        "camera_id": camera["id"],
-                        "location": {"lat": camera["lat"], "lng": camera["lng"]},
-                        "confidence": min(0.9, 0.5 + (pattern["count"] * 0.1)),
-                        "reasoning": f"Pattern detected: {pattern['count']} similar incidents"
-                    }
-        
+                if camera["id"] in seen:
+                    continue
+                if last_location.get("lat") and last_location.get("lng"):
+                    distance = self._calculate_distance(
+                        last_location["lat"], last_location["lng"],
+                        camera["lat"], camera["lng"]
+                    )
+                else:
+                    distance = 0.0
+                if best_distance is None or distance < best_distance:
+                    best_camera = camera
+                    best_distance = distance
+
+            if best_camera:
+                return {
+                    "camera_id": best_camera["id"],
+                    "location": {"lat": best_camera["lat"], "lng": best_camera["lng"]},
+                    "confidence": min(0.9, 0.5 + (pattern["count"] * 0.1)),
+                    "reasoning": f"Pattern detected: {pattern['count']} similar incidents"
+                }
+
         return None
 
@@ -6,8 +6,13 @@ Wildlife and Wildfire Detection System
 import cv2
 import numpy as np
 from typing import Dict, Any, Optional, List, Tuple
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from time import monotonic_ns, time as _time
 import os
+import queue
+import threading
 
 # Try to import YOLO - optional dependency
 try:
@@ -17,55 +22,343 @@ except ImportError:
     YOLO_AVAILABLE = False
     YOLO = None
 
+# Torch only needed to probe for CUDA (TensorRT engine path)
+try:
+    import torch
+    CUDA_AVAILABLE = torch.cuda.is_available()
+except ImportError:
+    torch = None
+    CUDA_AVAILABLE = False
+
+# Numba compiles the per-frame scoring arithmetic to machine code - optional
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    njit = None
+    prange = range
+
+# PyAV gives multi-threaded (and where built with hwaccel, hardware) video
+# decoding for file analysis - optional, OpenCV capture remains the fallback
+try:
+    import av
+    PYAV_AVAILABLE = True
+except ImportError:
+    PYAV_AVAILABLE = False
+    av = None
+
+# Detection timestamps only need wall-clock precision, so one formatted
+# string is reused for a short window instead of running the full
+# datetime.now().isoformat() path on every frame of a batch
+_TS_WINDOW_NS = 50_000_000  # 50ms
+_ts_cache_ns = 0
+_ts_cache_value = ""
+
+
+def _now_iso() -> str:
+    """datetime.now().isoformat(), cached for a 50ms window"""
+    global _ts_cache_ns, _ts_cache_value
+    now = monotonic_ns()
+    if not _ts_cache_value or now - _ts_cache_ns >= _TS_WINDOW_NS:
+        _ts_cache_value = datetime.now().isoformat()
+        _ts_cache_ns = now
+    return _ts_cache_value
+
+
+# Movement patterns encoded for the compiled scoring kernel:
+# 1 = animal-like (slow_deliberate / moderate / erratic), 2 = fast_movement
+_PATTERN_CODES = {"slow_deliberate": 1, "moderate": 1, "erratic": 1, "fast_movement": 2}
+
+
+def _wildlife_score_core(
+    edge_density: float, std_intensity: float, motion_speed: float,
+    motion_consistency: float, persistent_activity: float,
+    pattern_code: int, animals_count: int, has_animals: bool,
+    persistent_wildlife: bool
+) -> float:
+    """Scalar scoring arithmetic of _calculate_wildlife_score (numba-friendly)"""
+    score = 0.0
+
+    # Factor 1: Edge density (indicates movement/activity)
+    if 0.08 < edge_density < 0.25:  # Good range for animal movement
+        score += 0.15
+    elif edge_density > 0.25:  # Too high = likely noise
+        score += 0.05
+
+    # Factor 2: Motion consistency (concentrated motion = animal, scattered = noise)
+    if motion_consistency > 0.3:  # Motion is concentrated (likely an animal)
+        score += 0.20
+    elif motion_consistency < 0.1:  # Scattered motion (likely noise)
+        score -= 0.10  # Penalty
+
+    # Factor 3: Motion speed (animals move at various speeds)
+    if 0.01 < motion_speed < 0.15:  # Animal movement range
+        score += 0.15
+    elif motion_speed > 0.20:  # Too fast = likely noise
+        score -= 0.05
+
+    # Factor 4: Persistent activity (animals often stay in area)
+    if persistent_activity > 0.5:  # Activity for 50%+ of recent frames
+        score += 0.25
+    elif persistent_activity < 0.2:  # Brief activity
+        score -= 0.10  # Penalty
+
+    # Factor 5: Movement pattern
+    if pattern_code == 1:
+        score += 0.10  # Animal-like movement
+    elif pattern_code == 2:
+        score += 0.05  # Could be animal running
+
+    # Factor 6: Intensity variation
+    if 20.0 < std_intensity < 90.0:  # Moderate variation
+        score += 0.05
+
+    # Factor 7: Animal Detection (MOST IMPORTANT!)
+    if animals_count > 0:
+        score += 0.30  # Strong indicator of wildlife
+        if animals_count > 1:
+            score += 0.10  # Multiple animals
+    elif has_animals:
+        score += 0.15  # Animal detected but low confidence
+
+    # Factor 8: Persistent wildlife presence
+    if persistent_wildlife:
+        score += 0.15  # Animals staying in area
+
+    # If no animals detected but high motion, reduce score (likely false positive)
+    if not has_animals and motion_speed > 0.15:
+        score -= 0.15  # High motion but no animal = likely noise
+
+    return max(0.0, min(1.0, score))  # Clamp between 0 and 1
+
+
+if NUMBA_AVAILABLE:
+    _wildlife_score_core = njit(cache=True)(_wildlife_score_core)
+
+
+def _fire_smoke_motion_counts(hsv, gray_cur, gray_prev, has_prev):
+    """
+    Count fire-colored, smoke-colored, and motion pixels in one fused pass
+
+    Same predicates as the OpenCV inRange/absdiff chain in _detect_fire
+    (fire: h<=30, s>=50, v>=50; smoke: s<=50, 50<=v<=200; motion:
+    |cur-prev|>30), but each pixel is read once instead of streaming the
+    frame through five separate mask kernels.
+    """
+    fire = 0
+    smoke = 0
+    motion = 0
+    for i in prange(hsv.shape[0]):
+        row_fire = 0
+        row_smoke = 0
+        row_motion = 0
+        for j in range(hsv.shape[1]):
+            h = hsv[i, j, 0]
+            s = hsv[i, j, 1]
+            v = hsv[i, j, 2]
+            if h <= 30 and s >= 50 and v >= 50:
+                row_fire += 1
+            if s <= 50 and 50 <= v <= 200:
+                row_smoke += 1
+            if has_prev:
+                d = int(gray_cur[i, j]) - int(gray_prev[i, j])
+                if d > 30 or d < -30:
+                    row_motion += 1
+        fire += row_fire
+        smoke += row_smoke
+        motion += row_motion
+    return fire, smoke, motion
+
+
+if NUMBA_AVAILABLE:
+    _fire_smoke_motion_counts = njit(cache=True, parallel=True)(_fire_smoke_motion_counts)
+
+
+def _gray_motion_ratio(gray_cur, gray_prev):
+    """
+    Fraction of pixels whose gray delta exceeds the motion threshold
+
+    Fuses the absdiff / threshold / count chain used by the live-frame
+    motion gate into one pass that keeps only a scalar counter - no diff
+    frame or mask is ever materialized.
+    """
+    count = 0
+    for i in prange(gray_cur.shape[0]):
+        row_count = 0
+        for j in range(gray_cur.shape[1]):
+            d = int(gray_cur[i, j]) - int(gray_prev[i, j])
+            if d > 30 or d < -30:
+                row_count += 1
+        count += row_count
+    return count / gray_cur.size
+
+
+if NUMBA_AVAILABLE:
+    _gray_motion_ratio = njit(cache=True, parallel=True)(_gray_motion_ratio)
+
 class VideoAnalyzer:
     """Analyzes video frames using computer vision + YOLO object detection for wildlife and wildfire detection"""
     
     def __init__(self):
-        self.detection_history: List[Dict[str, Any]] = []
-        self.frame_buffer: List[np.ndarray] = []  # Store recent frames for temporal analysis
-        self.motion_history: List[float] = []  # Track motion over time
+        # Bounded histories: deque(maxlen=N) evicts the oldest entry in O(1)
+        # on append, replacing the per-frame len-check + O(N) list.pop(0)
+        self.detection_history: deque = deque(maxlen=100)
+        # Recent gray frames for temporal analysis live in a preallocated
+        # ring buffer - one in-place copy per frame, no per-frame allocation
+        self._frame_ring: Optional[np.ndarray] = None
+        self._ring_idx = 0
+        self._ring_count = 0
+        self.motion_history: deque = deque(maxlen=30)  # Track motion over time
         self.activity_duration = 0  # How long activity has been detected
-        self.object_history: List[Dict[str, Any]] = []  # Track detected objects over time
+        self.object_history: deque = deque(maxlen=30)  # Track detected objects over time
+        self._prev_gray_live: Optional[np.ndarray] = None  # Cached gray of last live frame
+        # Ping-pong gray buffers for the live path: cvtColor writes into the
+        # full-res scratch, the analysis-size downscale lands in the spare
+        # small buffer while _prev_gray_live keeps pointing at the other, so
+        # no per-frame gray allocation (same scheme as the agent's frame
+        # buffers)
+        self._live_gray_full: Optional[np.ndarray] = None
+        self._live_gray_bufs: Optional[List[np.ndarray]] = None
+        self._live_gray_idx = 0
+        # Scratch buffers reused by the motion diff (absdiff/threshold write
+        # into these instead of allocating per frame), plus a per-frame memo
+        # so the YOLO gate and _analyze_motion don't diff the same pair twice.
+        # These stay plain ndarrays rather than cv2.UMat: at 320x240 the
+        # OpenCL upload/download round-trip per op costs more than the op
+        # itself, and the numba kernels need host memory anyway
+        self._diff_buf: Optional[np.ndarray] = None
+        self._mask_buf: Optional[np.ndarray] = None
+        self._frame_seq = 0
+        self._motion_memo_seq = -1
+        self._motion_memo_pixels = 0
+        # Last computed edge density, reused while the scene is static
+        self._last_edge_density: Optional[float] = None
         
         # Initialize YOLO model if available
         self.yolo_model = None
         if YOLO_AVAILABLE:
             try:
-                # Load pretrained YOLOv8 model (automatically downloads if needed)
-                self.yolo_model = YOLO('yolov8n.pt')  # nano version for speed, can use 'yolov8s.pt' or 'yolov8m.pt' for better accuracy
+                self.yolo_model = self._load_yolo_model()
                 print("YOLO model loaded successfully")
             except Exception as e:
                 print(f"Warning: Could not load YOLO model: {e}")
                 self.yolo_model = None
         else:
             print("YOLO not available - install with: pip install ultralytics")
+
+        # Inference call arguments: FP16 compute on the GPU when present
+        self._yolo_call_args: Dict[str, Any] = {"verbose": False}
+        if CUDA_AVAILABLE:
+            self._yolo_call_args.update(device=0, half=True)
+
+        # Single worker that runs YOLO while the main thread does the CPU
+        # feature pass (torch/OpenCV release the GIL, so the two overlap)
+        self._yolo_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="yolo") if self.yolo_model else None
+
+        # Static-scene YOLO gate state: last result and how many consecutive
+        # YOLO calls came back with zero detections
+        self._last_objects: Optional[Dict[str, Any]] = None
+        self._empty_streak = 0
+
+        # Pinned (page-locked) staging buffer for batched YOLO input on the
+        # GPU path - host-to-device copies from pinned memory run ~2x faster
+        self._pinned_batch = None
+        self._pinned_batch_view: Optional[np.ndarray] = None
+
+    def _load_yolo_model(self):
+        """
+        Load the YOLO model, preferring a cached TensorRT FP16 engine on GPU
+
+        On a CUDA machine the PyTorch checkpoint is exported once to a
+        TensorRT engine (half precision, batch size matching
+        YOLO_BATCH_SIZE) and the .engine file is reused on later startups -
+        roughly 2x throughput over eager FP32. On CPU, or if the export
+        fails, we stay on the plain .pt checkpoint.
+        """
+        if CUDA_AVAILABLE:
+            engine_path = 'yolov8n.engine'
+            try:
+                if not os.path.exists(engine_path):
+                    print("Exporting YOLOv8n to TensorRT FP16 engine (one-time)...")
+                    export_args: Dict[str, Any] = dict(
+                        format='engine', imgsz=640, half=True,
+                        batch=self.YOLO_BATCH_SIZE, dynamic=True, device=0
+                    )
+                    if os.environ.get('URSA_TRT_INT8') == '1':
+                        # INT8 quantization - needs a calibration set, so
+                        # point URSA_TRT_CALIB_DATA at a dataset yaml of
+                        # representative frames
+                        export_args['int8'] = True
+                        calib_data = os.environ.get('URSA_TRT_CALIB_DATA')
+                        if calib_data:
+                            export_args['data'] = calib_data
+                    YOLO('yolov8n.pt').export(**export_args)
+                return YOLO(engine_path)
+            except Exception as e:
+                print(f"Warning: TensorRT engine unavailable ({e}), using PyTorch model")
+        # Nano version for speed, can use 'yolov8s.pt' or 'yolov8m.pt' for better accuracy
+        return YOLO('yolov8n.pt')
     
-    def analyze_frame(self, frame: np.ndarray, camera_id: str) -> Optional[Dict[str, Any]]:
+    def analyze_frame(self, frame: np.ndarray, camera_id: str, detected_objects: Optional[Dict[str, Any]] = None, gray: Optional[np.ndarray] = None) -> Optional[Dict[str, Any]]:
         """
         Analyze a single video frame for wildlife and wildfire using YOLO + motion detection
-        
+
         Args:
             frame: OpenCV frame (numpy array, BGR format)
             camera_id: ID of the camera
-            
+            detected_objects: Optional precomputed YOLO results (from a batched
+                call) - skips the per-frame YOLO inference when provided
+            gray: Optional precomputed grayscale of frame - skips the cvtColor
+                when the caller already converted (live path)
+
         Returns:
             Detection dict if wildlife or wildfire found, None otherwise
         """
-        # Convert to grayscale for processing
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        
+        self._frame_seq += 1  # Invalidates the per-frame motion memo
+
+        # Convert to grayscale for processing (unless the caller already did)
+        if gray is None:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+        # Motion and edge features are coarse scalars - computing them at
+        # reduced resolution gives the same ratios at ~15x less pixel work
+        # (frame_buffer holds these small frames, cutting its memory too)
+        if (gray.shape[1], gray.shape[0]) != self.ANALYSIS_SIZE:
+            gray = cv2.resize(gray, self.ANALYSIS_SIZE, interpolation=cv2.INTER_AREA)
+
         # Get previous frame for motion analysis
-        previous = self.frame_buffer[-2] if len(self.frame_buffer) >= 2 else None
-        
+        previous = self._ring_previous()
+
+        # Kick off YOLO so the GPU/model works while this thread runs the
+        # CPU feature pass below (wall time becomes max of the two, not the
+        # sum) - unless the scene has been static and empty long enough to
+        # reuse the last result
+        yolo_future = None
+        if detected_objects is not None:
+            # Precomputed by a batched call - keep temporal history consistent
+            self._record_object_history(detected_objects)
+        elif self.yolo_model:
+            if self._can_skip_yolo(gray, previous):
+                detected_objects = self._last_objects
+            else:
+                yolo_future = self._yolo_pool.submit(self._detect_objects, frame)
+
         # Step 1: Fire/smoke detection (color-based, before object detection)
         fire_detection = self._detect_fire(frame, gray, previous, camera_id)
-        
-        # Step 2: Object detection with YOLO (if available) - for wildlife
-        detected_objects = self._detect_objects(frame) if self.yolo_model else None
-        
-        # Step 3: Motion analysis
+
+        # Step 2: Motion analysis
         motion_data = self._analyze_motion(gray, previous) if previous is not None else (0.0, 0.0)
-        
+
+        # Step 3: Collect the YOLO result (waits only if CPU work won the race)
+        if yolo_future is not None:
+            detected_objects = yolo_future.result()
+            self._last_objects = detected_objects
+            if detected_objects.get("count", 0) == 0:
+                self._empty_streak += 1
+            else:
+                self._empty_streak = 0
+
         # Step 4: Fire takes priority - return immediately if detected
         if fire_detection:
             return fire_detection
@@ -84,6 +377,15 @@ class VideoAnalyzer:
         
         return detection
     
+    # HSV bounds for the fire (red/orange/yellow) and smoke (grayish) masks,
+    # built once instead of six fresh np.array allocations per frame
+    _LOWER_FIRE1 = np.array([0, 50, 50], dtype=np.uint8)     # Red lower bound
+    _UPPER_FIRE1 = np.array([10, 255, 255], dtype=np.uint8)  # Red upper bound
+    _LOWER_FIRE2 = np.array([10, 50, 50], dtype=np.uint8)    # Orange lower bound
+    _UPPER_FIRE2 = np.array([30, 255, 255], dtype=np.uint8)  # Orange/Yellow upper bound
+    _LOWER_SMOKE = np.array([0, 0, 50], dtype=np.uint8)
+    _UPPER_SMOKE = np.array([180, 50, 200], dtype=np.uint8)
+
     def _detect_fire(self, frame: np.ndarray, gray_frame: np.ndarray, previous_frame: Optional[np.ndarray], camera_id: str) -> Optional[Dict[str, Any]]:
         """
         Detect fire and smoke using color analysis and motion patterns
@@ -91,36 +393,57 @@ class VideoAnalyzer:
         Returns:
             Detection dict if fire detected, None otherwise
         """
+        # Cheap early-out on frames with no warm pixels at all: fire-hued
+        # pixels (H <= 30) peak in the red channel, so V equals R there and
+        # the fire mask's V >= 50 floor means a frame whose red plane never
+        # reaches 50 cannot contain a single fire pixel; smoke alone tops
+        # out at a fire_score of 0.1, well under the 0.5 threshold. The
+        # strided max rules such frames out before any resize/HSV work
+        if int(frame[::16, ::16, 2].max()) < 50:
+            return None
+
+        # Fire/smoke densities are resolution-invariant ratios, so the color
+        # analysis runs on a downscaled frame - same thresholds, ~20x less
+        # memory traffic through the HSV/inRange/mask chain
+        small = cv2.resize(frame, self.ANALYSIS_SIZE, interpolation=cv2.INTER_AREA)
+
         # Convert BGR to HSV for better color detection
-        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-        
-        # Define color ranges for fire (red, orange, yellow)
-        # Fire colors in HSV
-        lower_fire1 = np.array([0, 50, 50])    # Red lower bound
-        upper_fire1 = np.array([10, 255, 255]) # Red upper bound
-        lower_fire2 = np.array([10, 50, 50])   # Orange lower bound
-        upper_fire2 = np.array([30, 255, 255]) # Orange/Yellow upper bound
-        
-        # Create masks for fire colors
-        mask1 = cv2.inRange(hsv, lower_fire1, upper_fire1)
-        mask2 = cv2.inRange(hsv, lower_fire2, upper_fire2)
-        fire_mask = cv2.bitwise_or(mask1, mask2)
-        
-        # Calculate fire pixel density
-        fire_pixel_count = np.sum(fire_mask > 0)
-        total_pixels = fire_mask.shape[0] * fire_mask.shape[1]
-        fire_density = fire_pixel_count / total_pixels
-        
-        # Check for smoke (grayish colors, high motion, expanding)
-        gray_mask = cv2.inRange(hsv, np.array([0, 0, 50]), np.array([180, 50, 200]))
-        smoke_pixel_count = np.sum(gray_mask > 0)
-        smoke_density = smoke_pixel_count / total_pixels
-        
-        # Motion analysis for fire (fire flickers and moves)
-        motion_intensity = 0.0
-        if previous_frame is not None:
-            diff = cv2.absdiff(gray_frame, previous_frame)
-            motion_intensity = np.sum(diff > 30) / total_pixels
+        hsv = cv2.cvtColor(small, cv2.COLOR_BGR2HSV)
+        total_pixels = hsv.shape[0] * hsv.shape[1]
+
+        has_prev = (previous_frame is not None and
+                    previous_frame.shape == gray_frame.shape)
+
+        if NUMBA_AVAILABLE and gray_frame.shape == hsv.shape[:2]:
+            # Fused single pass: one read of HSV + both grays replaces the
+            # inRange/bitwise/absdiff chain and its five mask sweeps - this
+            # path is memory-bound, so fewer passes is the whole win
+            fire_pixel_count, smoke_pixel_count, motion_count = _fire_smoke_motion_counts(
+                hsv, gray_frame,
+                previous_frame if has_prev else gray_frame,
+                has_prev
+            )
+            fire_density = fire_pixel_count / total_pixels
+            smoke_density = smoke_pixel_count / total_pixels
+            motion_intensity = motion_count / gray_frame.size if has_prev else 0.0
+        else:
+            # OpenCV fallback: masks for fire colors (red, orange, yellow)
+            mask1 = cv2.inRange(hsv, self._LOWER_FIRE1, self._UPPER_FIRE1)
+            mask2 = cv2.inRange(hsv, self._LOWER_FIRE2, self._UPPER_FIRE2)
+            fire_mask = cv2.bitwise_or(mask1, mask2)
+            fire_density = cv2.countNonZero(fire_mask) / total_pixels
+
+            # Check for smoke (grayish colors, high motion, expanding)
+            gray_mask = cv2.inRange(hsv, self._LOWER_SMOKE, self._UPPER_SMOKE)
+            smoke_density = cv2.countNonZero(gray_mask) / total_pixels
+
+            # Motion analysis for fire (fire flickers and moves) - gray frames
+            # arrive at analysis resolution, so normalize by their own size
+            motion_intensity = 0.0
+            if has_prev:
+                diff = cv2.absdiff(gray_frame, previous_frame)
+                _, motion_mask = cv2.threshold(diff, 30, 255, cv2.THRESH_BINARY)
+                motion_intensity = cv2.countNonZero(motion_mask) / motion_mask.size
         
         # Fire detection criteria
         fire_score = 0.0
@@ -141,7 +464,7 @@ class VideoAnalyzer:
                 "camera_id": camera_id,
                 "activity_type": "wildfire",
                 "confidence": float(confidence),
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _now_iso(),
                 "behavior": "wildfire",
                 "details": {
                     "description": f"Wildfire detected - fire density: {fire_density:.1%}, smoke density: {smoke_density:.1%}",
@@ -159,89 +482,237 @@ class VideoAnalyzer:
         
         return None
     
+    @staticmethod
+    def _empty_detection_result() -> Dict[str, Any]:
+        """Result dict for a frame with no usable YOLO output"""
+        return {"objects": [], "animals": [], "pets": [], "people": [], "count": 0}
+
     def _detect_objects(self, frame: np.ndarray) -> Dict[str, Any]:
         """
         Detect wildlife (animals) in frame using YOLO
-        
+
         Returns:
             Dict with detected animals, their classes, and positions
         """
         if not self.yolo_model:
-            return {"objects": [], "animals": [], "count": 0}
-        
+            return self._empty_detection_result()
+
         try:
-            # Run YOLO inference
-            results = self.yolo_model(frame, verbose=False)
-            
-            # Parse results
-            detected_objects = []
-            animals = []
-            pets = []
-            people = []
-            
-            # COCO animal class IDs for wildlife detection
-            # 14: bird, 15: cat, 16: dog, 17: horse, 18: sheep, 19: cow, 
-            # 20: elephant, 21: bear, 22: zebra, 23: giraffe
-            animal_class_ids = [14, 15, 16, 17, 18, 19, 20, 21, 22, 23]
-            
-            # Pet class IDs (domestic animals that could be lost pets)
-            pet_class_ids = [15, 16]  # cat, dog
-            person_class_id = 0  # COCO class 0 = person
-            
-            for result in results:
-                boxes = result.boxes
-                for box in boxes:
-                    # Get class and confidence
-                    cls = int(box.cls[0])
-                    conf = float(box.conf[0])
-                    
-                    # Get bounding box coordinates
-                    x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                    class_name = result.names[cls]
-                    
-                    obj_data = {
-                        "class_id": cls,
-                        "class_name": class_name,
-                        "confidence": conf,
-                        "bbox": [float(x1), float(y1), float(x2), float(y2)],
-                        "center": [float((x1 + x2) / 2), float((y1 + y2) / 2)],
-                        "area": float((x2 - x1) * (y2 - y1))
-                    }
-                    
-                    detected_objects.append(obj_data)
-                    
-                    # Categorize
-                    if cls == person_class_id and conf > 0.5:
-                        people.append(obj_data)
-                    elif cls in pet_class_ids and conf > 0.5:
-                        pets.append(obj_data)
-                    elif cls in animal_class_ids and conf > 0.5:
-                        animals.append(obj_data)
-                    
-            # Store in history for temporal analysis
-            self.object_history.append({
-                "timestamp": datetime.now().isoformat(),
-                "animals": animals,
-                "pets": pets,
-                "people": people,
-                "all_objects": detected_objects
-            })
-            if len(self.object_history) > 30:  # Keep last 30 frames
-                self.object_history.pop(0)
-            
-            return {
-                "objects": detected_objects,
-                "animals": animals,
-                "pets": pets,
-                "people": people,
-                "count": len(detected_objects),
-                "animals_count": len(animals),
-                "pets_count": len(pets),
-                "people_count": len(people)
-            }
+            # Run YOLO inference (staged through the pinned buffer on GPU)
+            results = self.yolo_model(self._stage_batch([frame])[0], **self._yolo_call_args)
+            parsed = self._parse_yolo_result(results[0])
+            self._record_object_history(parsed)
+            return parsed
         except Exception as e:
             print(f"YOLO detection error: {e}")
-            return {"objects": [], "animals": [], "pets": [], "people": [], "count": 0}
+            return self._empty_detection_result()
+
+    def _detect_objects_batch(self, frames: List[np.ndarray]) -> List[Dict[str, Any]]:
+        """
+        Detect objects in several frames with one batched YOLO call
+
+        Amortizes model dispatch overhead across frames (and enables batched
+        inference on GPU). Does NOT touch object_history - callers thread the
+        per-frame results back through analyze_frame for temporal tracking.
+
+        Returns:
+            One parsed detection dict per input frame, same format as _detect_objects
+        """
+        if not self.yolo_model or not frames:
+            return [self._empty_detection_result() for _ in frames]
+
+        try:
+            results = self.yolo_model(self._stage_batch(frames), **self._yolo_call_args)
+            return [self._parse_yolo_result(result) for result in results]
+        except Exception as e:
+            print(f"YOLO batch detection error: {e}")
+            return [self._empty_detection_result() for _ in frames]
+
+    def _stage_batch(self, frames: List[np.ndarray]) -> List[np.ndarray]:
+        """
+        Stage batch frames through pinned memory on the GPU path
+
+        Copies uniform uint8 frames once into a reusable page-locked torch
+        buffer and hands YOLO numpy views of it, so the model's
+        host-to-device upload runs at pinned-memory bandwidth. Without CUDA
+        (or with mixed frame shapes) the frames pass through untouched.
+        """
+        if not CUDA_AVAILABLE or not frames or frames[0].dtype != np.uint8:
+            return list(frames)
+        shape = frames[0].shape
+        if any(f.shape != shape for f in frames[1:]):
+            return list(frames)
+
+        capacity = max(len(frames), self.YOLO_BATCH_SIZE)
+        if (self._pinned_batch_view is None or
+                self._pinned_batch_view.shape[1:] != shape or
+                self._pinned_batch_view.shape[0] < len(frames)):
+            try:
+                self._pinned_batch = torch.empty(
+                    (capacity,) + shape, dtype=torch.uint8
+                ).pin_memory()
+                self._pinned_batch_view = self._pinned_batch.numpy()
+            except Exception:
+                # Pinned allocation can fail under memory pressure - degrade
+                # to the plain pageable path
+                self._pinned_batch = None
+                self._pinned_batch_view = None
+                return list(frames)
+
+        for i, frame in enumerate(frames):
+            np.copyto(self._pinned_batch_view[i], frame)
+        return [self._pinned_batch_view[i] for i in range(len(frames))]
+
+    # COCO class IDs used to categorize detections
+    # 14: bird, 15: cat, 16: dog, 17: horse, 18: sheep, 19: cow,
+    # 20: elephant, 21: bear, 22: zebra, 23: giraffe
+    _ANIMAL_CLASS_IDS = np.arange(14, 24, dtype=np.int32)
+    # Pet class IDs (domestic animals that could be lost pets): cat, dog
+    _PET_CLASS_IDS = np.array([15, 16], dtype=np.int32)
+    _PERSON_CLASS_ID = 0  # COCO class 0 = person
+
+    def _parse_yolo_result(self, result) -> Dict[str, Any]:
+        """Parse a single YOLO result into the detection dict format"""
+        # One device-to-host transfer for the whole (N, 6) detection tensor
+        # (x1, y1, x2, y2, conf, cls) instead of one cudaMemcpy per box field
+        data = result.boxes.data.cpu().numpy()
+
+        detected_objects = []
+        cls_arr = data[:, 5].astype(np.int32)
+        for row, cls in zip(data, cls_arr):
+            x1, y1, x2, y2 = row[0:4]
+            detected_objects.append({
+                "class_id": int(cls),
+                "class_name": result.names[int(cls)],
+                "confidence": float(row[4]),
+                "bbox": [float(x1), float(y1), float(x2), float(y2)],
+                "center": [float((x1 + x2) / 2), float((y1 + y2) / 2)],
+                "area": float((x2 - x1) * (y2 - y1))
+            })
+
+        # Categorize with boolean masks over the whole tensor instead of
+        # per-box membership tests; pets are excluded from animals to match
+        # the original if/elif precedence (person, then pet, then animal)
+        conf_ok = data[:, 4] > 0.5
+        person_mask = conf_ok & (cls_arr == self._PERSON_CLASS_ID)
+        pet_mask = conf_ok & np.isin(cls_arr, self._PET_CLASS_IDS)
+        animal_mask = (conf_ok & np.isin(cls_arr, self._ANIMAL_CLASS_IDS)
+                       & ~pet_mask)
+
+        people = [detected_objects[i] for i in np.flatnonzero(person_mask)]
+        pets = [detected_objects[i] for i in np.flatnonzero(pet_mask)]
+        animals = [detected_objects[i] for i in np.flatnonzero(animal_mask)]
+
+        return {
+            "objects": detected_objects,
+            "animals": animals,
+            "pets": pets,
+            "people": people,
+            "count": len(detected_objects),
+            "animals_count": len(animals),
+            "pets_count": len(pets),
+            "people_count": len(people)
+        }
+
+    # Static-scene YOLO gate: skip inference when under this fraction of
+    # pixels changed and the last YOLO_SKIP_MIN_STREAK calls found nothing
+    YOLO_SKIP_MOTION = 0.005
+    YOLO_SKIP_MIN_STREAK = 5
+
+    def _can_skip_yolo(self, gray: np.ndarray, previous: Optional[np.ndarray]) -> bool:
+        """
+        True when inference can be skipped for this frame
+
+        Only after several consecutive empty YOLO results, and only if the
+        frame barely differs from the previous one - then the cached empty
+        result is as good as a fresh call. On quiet cameras this removes
+        the single biggest cost on the frame path.
+        """
+        if (previous is None or self._last_objects is None or
+                self._empty_streak < self.YOLO_SKIP_MIN_STREAK or
+                previous.shape != gray.shape):
+            return False
+        motion_pixels = self._motion_mask_pixels(gray, previous)
+        return motion_pixels / gray.size < self.YOLO_SKIP_MOTION
+
+    def _motion_mask_pixels(self, current_frame: np.ndarray, previous_frame: np.ndarray) -> int:
+        """
+        Diff + threshold into the shared scratch buffers; return pixel count
+
+        Memoized per analyze_frame call: the YOLO gate and _analyze_motion
+        operate on the same gray pair, so the second caller in a frame
+        reuses the mask left in self._mask_buf instead of re-diffing.
+        """
+        if self._motion_memo_seq == self._frame_seq and self._mask_buf is not None \
+                and self._mask_buf.shape == current_frame.shape:
+            return self._motion_memo_pixels
+
+        if self._diff_buf is None or self._diff_buf.shape != current_frame.shape:
+            self._diff_buf = np.empty_like(current_frame)
+            self._mask_buf = np.empty_like(current_frame)
+        cv2.absdiff(current_frame, previous_frame, dst=self._diff_buf)
+        cv2.threshold(self._diff_buf, 30, 255, cv2.THRESH_BINARY, dst=self._mask_buf)
+
+        self._motion_memo_pixels = cv2.countNonZero(self._mask_buf)
+        self._motion_memo_seq = self._frame_seq
+        return self._motion_memo_pixels
+
+    # Number of recent gray frames retained for temporal analysis
+    FRAME_RING_SIZE = 10
+
+    def _ring_store(self, gray_frame: np.ndarray):
+        """
+        Copy a gray frame into the preallocated ring buffer
+
+        This replaced the old list-based frame_buffer that .copy()'d every
+        frame: slots live in one allocation made up front, and each frame
+        costs a single copyto of the small analysis-resolution gray plane.
+        """
+        if (self._frame_ring is None or
+                self._frame_ring.shape[1:] != gray_frame.shape):
+            # First frame or analysis-resolution change: (re)allocate once
+            self._frame_ring = np.empty(
+                (self.FRAME_RING_SIZE,) + gray_frame.shape, dtype=gray_frame.dtype
+            )
+            self._ring_idx = 0
+            self._ring_count = 0
+        np.copyto(self._frame_ring[self._ring_idx], gray_frame)
+        self._ring_idx = (self._ring_idx + 1) % self.FRAME_RING_SIZE
+        self._ring_count = min(self._ring_count + 1, self.FRAME_RING_SIZE)
+
+    def _ring_previous(self) -> Optional[np.ndarray]:
+        """View of the frame stored two frames back, or None if too few"""
+        if self._ring_count < 2:
+            return None
+        return self._frame_ring[(self._ring_idx - 2) % self.FRAME_RING_SIZE]
+
+    # Shared empty slot for history frames without detections of a category
+    _EMPTY_CENTERS = np.empty((0, 2), dtype=np.float32)
+
+    def _record_object_history(self, detected_objects: Dict[str, Any]):
+        """
+        Store a detection result in object_history for temporal analysis
+
+        Only center coordinates are ever read back (position-variance checks
+        in _detect_lost_pet and _analyze_wildlife_objects), so each slot
+        keeps compact float32 center arrays instead of the full detection
+        dicts with bboxes and class metadata.
+        """
+        animals = detected_objects.get("animals", [])
+        pets = detected_objects.get("pets", [])
+        self.object_history.append({
+            # Raw epoch float - history is internal, so no ISO formatting
+            # until something actually crosses the API boundary
+            "ts": _time(),
+            "animal_centers": (
+                np.array([a["center"] for a in animals], dtype=np.float32)
+                if animals else self._EMPTY_CENTERS
+            ),
+            "pet_centers": (
+                np.array([p["center"] for p in pets], dtype=np.float32)
+                if pets else self._EMPTY_CENTERS
+            )
+        })
     
     def _detect_lost_pet(
         self, frame: np.ndarray, gray_frame: np.ndarray, camera_id: str,
@@ -261,35 +732,31 @@ class VideoAnalyzer:
         
         pets = detected_objects.get("pets", [])
         people = detected_objects.get("people", [])
-        
-        if not pets or len(pets) == 0:
+
+        if not pets:
             return None
         
-        # Check if any pet is without a person nearby
-        lost_pets = []
-        for pet in pets:
-            pet_center = pet["center"]
-            pet_bbox = pet["bbox"]
-            
-            # Check if there's a person nearby (within 100 pixels)
-            has_person_nearby = False
-            for person in people:
-                person_center = person["center"]
-                # Calculate distance between pet and person centers
-                distance = np.sqrt(
-                    (pet_center[0] - person_center[0])**2 + 
-                    (pet_center[1] - person_center[1])**2
-                )
-                # Also check if person bbox overlaps with pet area
-                person_bbox = person["bbox"]
-                if (distance < 100 or 
-                    (person_bbox[0] < pet_bbox[2] + 50 and person_bbox[2] > pet_bbox[0] - 50 and
-                     person_bbox[1] < pet_bbox[3] + 50 and person_bbox[3] > pet_bbox[1] - 50)):
-                    has_person_nearby = True
-                    break
-            
-            if not has_person_nearby:
-                lost_pets.append(pet)
+        # Check if any pet is without a person nearby (within 100 pixels, or
+        # person bbox overlapping the pet area padded by 50px). All pet/person
+        # pairs are tested in one broadcast pass instead of a nested Python loop
+        if people:
+            pet_centers = np.array([p["center"] for p in pets])       # (K, 2)
+            pet_bbs = np.array([p["bbox"] for p in pets])             # (K, 4)
+            person_centers = np.array([p["center"] for p in people])  # (P, 2)
+            person_bbs = np.array([p["bbox"] for p in people])        # (P, 4)
+
+            delta = pet_centers[:, None, :] - person_centers[None, :, :]
+            near = (delta ** 2).sum(axis=2) < 100 ** 2                # (K, P)
+            overlaps = (
+                (person_bbs[None, :, 0] < pet_bbs[:, None, 2] + 50) &
+                (person_bbs[None, :, 2] > pet_bbs[:, None, 0] - 50) &
+                (person_bbs[None, :, 1] < pet_bbs[:, None, 3] + 50) &
+                (person_bbs[None, :, 3] > pet_bbs[:, None, 1] - 50)
+            )
+            has_person_nearby = (near | overlaps).any(axis=1)         # (K,)
+            lost_pets = [pet for pet, attended in zip(pets, has_person_nearby) if not attended]
+        else:
+            lost_pets = list(pets)
         
         if len(lost_pets) == 0:
             return None
@@ -300,21 +767,24 @@ class VideoAnalyzer:
         # Check if pet has been moving across frames (indicating it's not just in a yard)
         pet_moving = False
         if len(self.object_history) >= 5:
+            ref_x = lost_pets[0]["center"][0]
             recent_pet_positions = []
-            for hist in self.object_history[-5:]:
-                if hist.get("pets"):
-                    for p in hist["pets"]:
-                        # Check if it's the same pet (similar position)
-                        if abs(p["center"][0] - lost_pets[0]["center"][0]) < 200:
-                            recent_pet_positions.append(p["center"])
-            
-            if len(recent_pet_positions) >= 3:
-                # Calculate position variance
-                positions = np.array(recent_pet_positions)
-                position_variance = np.var(positions, axis=0).sum()
-                # High variance = pet moving around (not just in yard)
-                if position_variance > 5000:  # Pet has moved significantly
-                    pet_moving = True
+            for hist in list(self.object_history)[-5:]:
+                centers = hist["pet_centers"]
+                if centers.size:
+                    # Keep only positions of (likely) the same pet
+                    same_pet = centers[np.abs(centers[:, 0] - ref_x) < 200]
+                    if same_pet.size:
+                        recent_pet_positions.append(same_pet)
+
+            if recent_pet_positions:
+                positions = np.concatenate(recent_pet_positions)
+                if len(positions) >= 3:
+                    # Calculate position variance
+                    position_variance = np.var(positions, axis=0).sum()
+                    # High variance = pet moving around (not just in yard)
+                    if position_variance > 5000:  # Pet has moved significantly
+                        pet_moving = True
         
         # Also check motion speed
         if motion_speed > 0.02:  # Pet is moving
@@ -329,7 +799,7 @@ class VideoAnalyzer:
                 "camera_id": camera_id,
                 "activity_type": "lost_pet",
                 "confidence": float(confidence),
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _now_iso(),
                 "behavior": "lost_pet",
                 "details": {
                     "description": f"Lost {pet_type} detected - no owner nearby, moving across area",
@@ -364,26 +834,36 @@ class VideoAnalyzer:
         - Temporal analysis (persistent patterns)
         - Behavioral analysis (animal presence and movement)
         """
-        # Store frame for temporal analysis
-        self.frame_buffer.append(gray_frame.copy())
-        if len(self.frame_buffer) > 10:  # Keep last 10 frames
-            self.frame_buffer.pop(0)
-        
-        # Calculate frame statistics
-        mean_intensity = np.mean(gray_frame)
-        std_intensity = np.std(gray_frame)
+        # Store frame for temporal analysis (ring buffer keeps last 10)
+        self._ring_store(gray_frame)
         
-        # Edge detection for movement
-        edges = cv2.Canny(gray_frame, 50, 150)
-        edge_density = np.sum(edges > 0) / (edges.shape[0] * edges.shape[1])
+        # Calculate frame statistics on a 4x4-strided sample - these feed
+        # coarse thresholds, and 1/16th of the pixels estimates them within
+        # noise at a fraction of the memory traffic
+        sub = gray_frame[::4, ::4]
+        mean_intensity = float(sub.mean())
+        std_intensity = float(sub.std())
         
         # Motion analysis
         motion_speed, motion_consistency = motion_data
+
+        # Edge detection for movement - only the scalar density is used, so a
+        # Sobel gradient-magnitude threshold gives the same signal without
+        # Canny's blur + non-max suppression + hysteresis passes. On a
+        # static scene the edges haven't changed either, so the previous
+        # frame's density is reused and the gradient pass skipped entirely
+        if motion_speed < 0.005 and self._last_edge_density is not None:
+            edge_density = self._last_edge_density
+        else:
+            gx = cv2.Sobel(gray_frame, cv2.CV_16S, 1, 0, ksize=3)
+            gy = cv2.Sobel(gray_frame, cv2.CV_16S, 0, 1, ksize=3)
+            magnitude = cv2.add(cv2.convertScaleAbs(gx), cv2.convertScaleAbs(gy))
+            edge_mask = cv2.compare(magnitude, 40, cv2.CMP_GT)
+            edge_density = cv2.countNonZero(edge_mask) / edge_mask.size
+            self._last_edge_density = edge_density
         
         # Temporal analysis - check if activity is persistent
-        self.motion_history.append(edge_density)
-        if len(self.motion_history) > 30:  # Last 30 frames
-            self.motion_history.pop(0)
+        self.motion_history.append(edge_density)  # Last 30 frames (deque maxlen)
         
         # Calculate activity metrics
         persistent_activity = self._check_persistent_activity()
@@ -425,7 +905,7 @@ class VideoAnalyzer:
                     "camera_id": camera_id,
                     "activity_type": activity_type,
                     "confidence": float(confidence),
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": _now_iso(),
                     "behavior": activity_type,
                     "details": {
                         "description": description + " via computer vision + object detection",
@@ -461,24 +941,23 @@ class VideoAnalyzer:
             }
         
         animals = detected_objects.get("animals", [])
-        animal_types = list(set([a["class_name"] for a in animals]))
+        animal_types = list({a["class_name"] for a in animals})
         
         # Check for persistent wildlife presence (animals staying in area)
         persistent_wildlife = False
         if len(self.object_history) >= 10 and animals:
             # Check if animals have been in similar location for multiple frames
-            recent_animal_positions = []
-            for hist in self.object_history[-10:]:
-                if hist.get("animals"):
-                    for a in hist["animals"]:
-                        recent_animal_positions.append(a["center"])
-            
-            if len(recent_animal_positions) >= 5:
-                # Calculate position variance
-                positions = np.array(recent_animal_positions)
-                position_variance = np.var(positions, axis=0).sum()
-                if position_variance < 15000:  # Low variance = animals staying in same area
-                    persistent_wildlife = True
+            recent = [
+                hist["animal_centers"] for hist in list(self.object_history)[-10:]
+                if hist["animal_centers"].size
+            ]
+            if recent:
+                positions = np.concatenate(recent)
+                if len(positions) >= 5:
+                    # Calculate position variance
+                    position_variance = np.var(positions, axis=0).sum()
+                    if position_variance < 15000:  # Low variance = animals staying in same area
+                        persistent_wildlife = True
         
         return {
             "animals_count": len(animals),
@@ -505,35 +984,49 @@ class VideoAnalyzer:
     def _analyze_motion_impl(self, current_frame: np.ndarray, previous_frame: np.ndarray) -> Tuple[float, float]:
         """
         Analyze motion between frames
-        
+
+        The diff/threshold/count chain runs fused through shared uint8
+        scratch buffers (see _motion_mask_pixels) and the resulting mask
+        feeds findContours directly - no bool temporaries or astype copies.
+
         Returns:
             (motion_speed, motion_consistency)
             - motion_speed: How fast objects are moving (0-1)
             - motion_consistency: How consistent the motion is (0-1)
         """
-        # Frame differencing
-        diff = cv2.absdiff(current_frame, previous_frame)
-        motion_mask = diff > 30  # Threshold for motion
-        
+        # Frame differencing - binary uint8 mask straight from OpenCV, so no
+        # frame-sized bool temporary and the count runs in a SIMD kernel.
+        # Shared with the YOLO gate: if it already diffed this pair earlier
+        # in the frame, the mask and count are reused as-is
+        motion_pixels = self._motion_mask_pixels(current_frame, previous_frame)
+        motion_mask = self._mask_buf
+        # Consume the memo here: analyze_frame bumps _frame_seq once per
+        # frame, but direct callers (the /ws/video stream drives this
+        # method itself) never do, and without invalidation they would be
+        # served the first pair's count and mask forever
+        self._motion_memo_seq = -1
+
         # Motion speed: percentage of frame with motion
-        motion_speed = np.sum(motion_mask) / (motion_mask.shape[0] * motion_mask.shape[1])
-        
-        # Motion consistency: check if motion is in a concentrated area (object) vs scattered (noise)
-        if motion_speed > 0.01:  # If there's any motion
-            # Find contours of motion
-            contours, _ = cv2.findContours(motion_mask.astype(np.uint8), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            if contours:
-                # Largest motion area
-                largest_contour = max(contours, key=cv2.contourArea)
-                area = cv2.contourArea(largest_contour)
-                total_motion_area = np.sum(motion_mask)
-                # Consistency: how much motion is in the largest object vs total
-                motion_consistency = area / total_motion_area if total_motion_area > 0 else 0
-            else:
-                motion_consistency = 0
+        motion_speed = motion_pixels / motion_mask.size
+
+        # Motion consistency: check if motion is in a concentrated area (object) vs scattered (noise).
+        # Skip the full-mask findContours scan when there's essentially no
+        # motion (common case) or when most of the frame changed at once -
+        # a global lighting flash, where contours are meaningless anyway
+        if motion_speed <= 0.01 or motion_speed > 0.4:
+            return float(motion_speed), 0.0
+
+        # Find contours of motion
+        contours, _ = cv2.findContours(motion_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        if contours:
+            # Largest motion area
+            largest_contour = max(contours, key=cv2.contourArea)
+            area = cv2.contourArea(largest_contour)
+            # Consistency: how much motion is in the largest object vs total
+            motion_consistency = area / motion_pixels if motion_pixels > 0 else 0
         else:
             motion_consistency = 0
-        
+
         return float(motion_speed), float(motion_consistency)
     
     def _check_persistent_activity(self) -> float:
@@ -547,9 +1040,8 @@ class VideoAnalyzer:
             return 0.0
         
         # Check if activity has been consistent over recent frames
-        recent_activity = self.motion_history[-10:] if len(self.motion_history) >= 10 else self.motion_history
-        avg_activity = np.mean(recent_activity)
-        
+        recent_activity = list(self.motion_history)[-10:]
+
         # Activity is persistent if consistently above threshold
         threshold = 0.08
         persistent_frames = sum(1 for a in recent_activity if a > threshold)
@@ -567,7 +1059,7 @@ class VideoAnalyzer:
         if len(self.motion_history) < 5:
             return "static"
         
-        recent = self.motion_history[-10:] if len(self.motion_history) >= 10 else self.motion_history
+        recent = list(self.motion_history)[-10:]
         avg = np.mean(recent)
         std = np.std(recent)
         
@@ -590,63 +1082,20 @@ class VideoAnalyzer:
     ) -> float:
         """
         Calculate wildlife detection score using multiple factors + object detection
-        
+
         Higher score = more likely wildlife present. Threshold: 0.50
+
+        Thin wrapper: dict lookups happen once here, then the pure scalar
+        arithmetic runs in _wildlife_score_core (numba-compiled when available).
         """
-        score = 0.0
-        
-        # Factor 1: Edge density (indicates movement/activity)
-        if 0.08 < edge_density < 0.25:  # Good range for animal movement
-            score += 0.15
-        elif edge_density > 0.25:  # Too high = likely noise
-            score += 0.05
-        
-        # Factor 2: Motion consistency (concentrated motion = animal, scattered = noise)
-        if motion_consistency > 0.3:  # Motion is concentrated (likely an animal)
-            score += 0.20
-        elif motion_consistency < 0.1:  # Scattered motion (likely noise)
-            score -= 0.10  # Penalty
-        
-        # Factor 3: Motion speed (animals move at various speeds)
-        if 0.01 < motion_speed < 0.15:  # Animal movement range
-            score += 0.15
-        elif motion_speed > 0.20:  # Too fast = likely noise
-            score -= 0.05
-        
-        # Factor 4: Persistent activity (animals often stay in area)
-        if persistent_activity > 0.5:  # Activity for 50%+ of recent frames
-            score += 0.25
-        elif persistent_activity < 0.2:  # Brief activity
-            score -= 0.10  # Penalty
-        
-        # Factor 5: Movement pattern
-        if movement_pattern in ["slow_deliberate", "moderate", "erratic"]:
-            score += 0.10  # Animal-like movement
-        elif movement_pattern == "fast_movement":
-            score += 0.05  # Could be animal running
-        
-        # Factor 6: Intensity variation
-        if 20 < std_intensity < 90:  # Moderate variation
-            score += 0.05
-        
-        # Factor 7: Animal Detection (MOST IMPORTANT!)
-        animals_count = object_analysis.get("animals_count", 0)
-        if animals_count > 0:
-            score += 0.30  # Strong indicator of wildlife
-            if animals_count > 1:
-                score += 0.10  # Multiple animals
-        elif object_analysis.get("has_animals", False):
-            score += 0.15  # Animal detected but low confidence
-        
-        # Factor 8: Persistent wildlife presence
-        if object_analysis.get("persistent_wildlife", False):
-            score += 0.15  # Animals staying in area
-        
-        # If no animals detected but high motion, reduce score (likely false positive)
-        if not object_analysis.get("has_animals", False) and motion_speed > 0.15:
-            score -= 0.15  # High motion but no animal = likely noise
-        
-        return max(0.0, min(1.0, score))  # Clamp between 0 and 1
+        return float(_wildlife_score_core(
+            float(edge_density), float(std_intensity), float(motion_speed),
+            float(motion_consistency), float(persistent_activity),
+            _PATTERN_CODES.get(movement_pattern, 0),
+            int(object_analysis.get("animals_count", 0)),
+            bool(object_analysis.get("has_animals", False)),
+            bool(object_analysis.get("persistent_wildlife", False))
+        ))
     
     def _classify_wildlife_activity(
         self, gray_frame: np.ndarray, edge_density: float, 
@@ -677,8 +1126,8 @@ class VideoAnalyzer:
         # Fallback to motion-only classification if no objects detected
         # (for cases where YOLO misses detection but motion is clear)
         if not has_animals:
-            if (movement_pattern in ["slow_deliberate", "moderate", "erratic"] and 
-                0.08 < edge_density < 0.25 and 
+            if (_PATTERN_CODES.get(movement_pattern) == 1 and
+                0.08 < edge_density < 0.25 and
                 0.01 < motion_speed < 0.15 and
                 persistent_activity > 0.5):
                 return "wildlife_detected"
@@ -689,66 +1138,254 @@ class VideoAnalyzer:
         
         return None
     
+    # Sampled frames are accumulated and run through YOLO in groups of this
+    # size - batch=1 leaves the model (especially on GPU) badly under-utilized
+    YOLO_BATCH_SIZE = 16
+
+    # Motion/edge analysis resolution (width, height) - full camera
+    # resolution only matters for the YOLO and fire-color paths
+    ANALYSIS_SIZE = (320, 240)
+
     def analyze_video_file(self, video_path: str, camera_id: str, sample_rate: int = 30) -> List[Dict[str, Any]]:
         """
         Analyze a video file frame by frame
-        
+
+        Decode runs on a dedicated reader thread feeding a bounded queue,
+        and YOLO runs batched, so I/O, inference and the CPU feature pass
+        already overlap. A process pool would not help here: frames are
+        expensive to pickle across processes, and the motion/history state
+        (frame ring, motion_history, object_history) is temporal - frames
+        must be scored in order against the analyzer's own recent past.
+
         Args:
             video_path: Path to video file
             camera_id: ID of the camera
             sample_rate: Analyze every Nth frame (default: every 30th frame = ~1 per second at 30fps)
-            
+
         Returns:
             List of detections found in the video
         """
         if not os.path.exists(video_path):
             return []
-        
+
         detections = []
+        batch: List[np.ndarray] = []
+
+        def flush_batch():
+            # One YOLO call for the whole batch, then the per-frame motion /
+            # scoring pipeline in order (temporal history stays consistent)
+            batch_objects = self._detect_objects_batch(batch) if self.yolo_model else [None] * len(batch)
+            for sampled, objects in zip(batch, batch_objects):
+                detection = self.analyze_frame(sampled, camera_id, objects)
+                if detection:
+                    detections.append(detection)
+            batch.clear()
+
+        # Decode on a separate thread so disk reads + decoding overlap with
+        # YOLO/feature compute; the bounded queue gives back-pressure if
+        # analysis falls behind. Detector state (motion/object histories)
+        # mutates on this thread only, so compute stays here. Sampling
+        # happens inside the iterator so skipped frames are never fully
+        # decoded/converted.
+        frame_queue: queue.Queue = queue.Queue(maxsize=16)
+
+        def read_frames():
+            try:
+                for decoded in self._iter_video_frames(video_path, sample_rate):
+                    frame_queue.put(decoded)
+            finally:
+                frame_queue.put(None)  # Sentinel: end of stream
+
+        reader = threading.Thread(target=read_frames, name="video-decode", daemon=True)
+        reader.start()
+
+        while True:
+            frame = frame_queue.get()
+            if frame is None:
+                break
+            batch.append(frame)
+            if len(batch) >= self.YOLO_BATCH_SIZE:
+                flush_batch()
+        if batch:
+            flush_batch()
+        reader.join()
+
+        return detections
+
+    def _iter_video_frames(self, video_path: str, sample_rate: int = 1):
+        """
+        Yield every sample_rate-th BGR frame from a video file
+
+        Prefers PyAV with threaded decoding (thread_type AUTO enables
+        frame- and slice-parallel decode, and hardware acceleration where
+        the FFmpeg build supports it), converting only the sampled frames
+        to ndarrays. The cv2.VideoCapture fallback uses grab() to step
+        over skipped frames without the full decode + copy of read().
+
+        Frames are requested as bgr24 rather than taking the decoder's
+        yuv420p Y plane as a free grayscale: every sampled frame goes
+        through YOLO and the HSV fire/smoke analysis, both of which need
+        full color, so a luma-only decode would just move the colorspace
+        conversion downstream instead of removing it.
+        """
+        if PYAV_AVAILABLE:
+            try:
+                with av.open(video_path) as container:
+                    stream = container.streams.video[0]
+                    stream.thread_type = "AUTO"
+                    for i, frame in enumerate(container.decode(stream)):
+                        if i % sample_rate == 0:
+                            # Colorspace conversion only for kept frames
+                            yield frame.to_ndarray(format="bgr24")
+                return
+            except Exception as e:
+                print(f"PyAV decode failed ({e}), falling back to OpenCV")
+
         cap = cv2.VideoCapture(video_path)
-        frame_count = 0
-        
         if not cap.isOpened():
-            return []
-        
+            return
         try:
-            while True:
-                ret, frame = cap.read()
-                if not ret:
-                    break
-                
-                # Sample frames (don't analyze every single frame)
-                if frame_count % sample_rate == 0:
-                    detection = self.analyze_frame(frame, camera_id)
-                    if detection:
-                        detections.append(detection)
-                
-                frame_count += 1
+            if (sample_rate >= self._SEEK_MIN_SAMPLE_RATE and
+                    self._supports_frame_seek(cap, sample_rate)):
+                # Sparse sampling on a seekable container: jump straight to
+                # each sampled frame so the frames in between are never even
+                # demuxed, let alone decoded
+                total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+                for idx in range(0, total, sample_rate):
+                    if not cap.set(cv2.CAP_PROP_POS_FRAMES, idx):
+                        break
+                    ret, frame = cap.read()
+                    if not ret:
+                        break
+                    yield frame
+                return
+
+            i = 0
+            while cap.grab():
+                if i % sample_rate == 0:
+                    ret, frame = cap.retrieve()
+                    if not ret:
+                        break
+                    yield frame
+                i += 1
         finally:
             cap.release()
-        
-        return detections
+
+    # Seeking only beats linear grab() when samples are sparse enough that
+    # whole GOPs can be skipped between them
+    _SEEK_MIN_SAMPLE_RATE = 10
+
+    @staticmethod
+    def _supports_frame_seek(cap, sample_rate: int) -> bool:
+        """
+        Probe whether a capture seeks accurately by frame index
+
+        Some backends (live streams, variable-frame-rate files) report no
+        frame count or land on the nearest keyframe instead of the exact
+        index; those fall back to the linear grab() loop.
+        """
+        total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+        if total <= sample_rate:
+            return False
+        if not cap.set(cv2.CAP_PROP_POS_FRAMES, sample_rate):
+            return False
+        ok = int(cap.get(cv2.CAP_PROP_POS_FRAMES)) == sample_rate
+        cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        return ok
     
-    def process_live_frame(self, frame: np.ndarray, camera_id: str, previous_frame: Optional[np.ndarray] = None) -> Optional[Dict[str, Any]]:
+    def process_live_frame(self, frame: np.ndarray, camera_id: str, previous_frame: Optional[np.ndarray] = None, detected_objects: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
         """
         Process a frame for live video analysis with frame differencing
-        
+
         Args:
             frame: Current frame
             camera_id: Camera ID
             previous_frame: Previous frame for motion detection
-            
+            detected_objects: Optional precomputed YOLO results (batched path)
+
         Returns:
             Detection if found
         """
-        if previous_frame is not None:
-            # Frame differencing for motion detection
-            diff = cv2.absdiff(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), 
-                              cv2.cvtColor(previous_frame, cv2.COLOR_BGR2GRAY))
-            motion = np.sum(diff > 30) / (diff.shape[0] * diff.shape[1])
-            
-            if motion > 0.05:  # Significant motion detected
-                return self.analyze_frame(frame, camera_id)
-        
-        return self.analyze_frame(frame, camera_id)
+        # One BGR->gray conversion per frame: the same gray drives the motion
+        # gate here, is cached as next frame's "previous" gray, and is handed
+        # to analyze_frame so it doesn't convert again. Fusing the luma
+        # computation into the motion kernel would not remove this pass -
+        # the gray plane is needed every frame regardless for the temporal
+        # chain, and cvtColor's SIMD path beats a scalar luma loop
+        h, w = frame.shape[:2]
+        if self._live_gray_full is None or self._live_gray_full.shape != (h, w):
+            # First frame or resolution change: (re)allocate once
+            aw, ah = self.ANALYSIS_SIZE
+            self._live_gray_full = np.empty((h, w), dtype=np.uint8)
+            self._live_gray_bufs = [np.empty((ah, aw), dtype=np.uint8),
+                                    np.empty((ah, aw), dtype=np.uint8)]
+            self._live_gray_idx = 0
+            self._prev_gray_live = None
+        cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._live_gray_full)
+        # Gate at analysis resolution: the >5% changed-pixel decision is a
+        # ratio and therefore scale-invariant, and the diff touches ~27x
+        # fewer bytes than at stream resolution. analyze_frame wants the
+        # same small gray anyway, so nothing is resized twice
+        gray = self._live_gray_bufs[self._live_gray_idx]
+        cv2.resize(self._live_gray_full, self.ANALYSIS_SIZE, dst=gray,
+                   interpolation=cv2.INTER_AREA)
+        self._live_gray_idx ^= 1
+        prev_gray = self._prev_gray_live
+        self._prev_gray_live = gray
+
+        if previous_frame is None:
+            # No reference frame yet - run the full pipeline
+            return self.analyze_frame(frame, camera_id, detected_objects, gray)
+
+        if prev_gray is None or prev_gray.shape != gray.shape:
+            # Cache miss (first frame after a reset) - convert and downscale
+            # the caller-supplied previous frame once
+            prev_gray = cv2.resize(
+                cv2.cvtColor(previous_frame, cv2.COLOR_BGR2GRAY),
+                self.ANALYSIS_SIZE, interpolation=cv2.INTER_AREA
+            )
+        # Frame differencing for motion detection - only the scalar ratio is
+        # needed here, so the fused kernel skips the diff and mask frames
+        if NUMBA_AVAILABLE:
+            motion = _gray_motion_ratio(gray, prev_gray)
+        else:
+            diff = cv2.absdiff(gray, prev_gray)
+            _, motion_mask = cv2.threshold(diff, 30, 255, cv2.THRESH_BINARY)
+            motion = cv2.countNonZero(motion_mask) / motion_mask.size
+
+        if motion <= 0.05:
+            # Static scene: skip YOLO, edge detection, and scoring entirely -
+            # the heavy pipeline only runs when something is actually moving
+            return None
+
+        return self.analyze_frame(frame, camera_id, detected_objects, gray)
+
+    def process_live_frame_batch(
+        self, frames: List[np.ndarray], camera_ids: List[str],
+        previous_frames: Optional[List[Optional[np.ndarray]]] = None
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Process frames from several cameras in one call
+
+        Runs YOLO once over the whole batch, then the per-frame motion and
+        scoring pipeline with the precomputed objects. Falls back to plain
+        per-frame processing when YOLO is unavailable.
+
+        Returns:
+            One detection (or None) per input frame
+        """
+        if previous_frames is None:
+            previous_frames = [None] * len(frames)
+
+        batch_objects = None
+        if self.yolo_model and len(frames) > 1:
+            batch_objects = self._detect_objects_batch(frames)
+
+        detections = []
+        for i, (frame, camera_id) in enumerate(zip(frames, camera_ids)):
+            detections.append(self.process_live_frame(
+                frame, camera_id, previous_frames[i],
+                batch_objects[i] if batch_objects else None
+            ))
+        return detections
 
@@ -7,7 +7,7 @@ from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request, Form
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Set
 import asyncio
 import json
 import os
@@ -19,6 +19,31 @@ from agents.camera_agent import CameraAgent
 from demo.scenarios.wildlife_detection import WildlifeDetectionScenario
 import uuid
 
+# orjson (C implementation) for the per-frame WebSocket payloads -
+# optional, stdlib json via send_json remains the fallback
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except (ImportError, ModuleNotFoundError):
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+async def send_json_fast(websocket: WebSocket, obj: Dict[str, Any]):
+    """
+    Send a JSON payload, serializing with orjson when available
+
+    Sent as a text frame (clients JSON.parse the message data) - orjson's
+    C serializer plus one decode still beats the stdlib json encoder by a
+    wide margin on the nested per-frame annotation dicts.
+    """
+    if ORJSON_AVAILABLE:
+        await websocket.send_text(
+            orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+        )
+    else:
+        await websocket.send_json(obj)
+
 # Twilio service will be accessed via coordinator
 
 load_dotenv()
@@ -42,31 +67,45 @@ if os.path.exists(video_dir):
 # WebSocket connection manager
 class ConnectionManager:
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        self.active_connections: Set[WebSocket] = set()
     
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
     
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        self.active_connections.discard(websocket)
     
     async def broadcast(self, message: Dict[str, Any]):
         """Broadcast message to all connected clients"""
-        disconnected = []
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except:
-                disconnected.append(connection)
-        
-        for conn in disconnected:
-            self.active_connections.remove(conn)
+        if not self.active_connections:
+            return
+        # Serialize once for every recipient instead of per connection
+        if ORJSON_AVAILABLE:
+            payload = orjson.dumps(
+                message, option=orjson.OPT_SERIALIZE_NUMPY
+            ).decode()
+        else:
+            payload = json.dumps(message)
+        # Fan out concurrently: total broadcast time becomes the slowest
+        # single send rather than the sum, and one slow client no longer
+        # stalls delivery to everyone else
+        connections = list(self.active_connections)
+        results = await asyncio.gather(
+            *(conn.send_text(payload) for conn in connections),
+            return_exceptions=True
+        )
+        for conn, result in zip(connections, results):
+            if isinstance(result, Exception):
+                self.active_connections.discard(conn)
 
 manager = ConnectionManager()
 
 # AI mode configuration (can be toggled)
 USE_REAL_AI = os.getenv("USE_REAL_AI", "false").lower() == "true"
+# Cap on how many frames per second the /ws/video analysis loop fully
+# decodes and runs through the AI pipeline (the rest are grab()-skipped)
+VIDEO_ANALYSIS_FPS = 10
 coordinator = AgentCoordinator(use_real_ai=USE_REAL_AI)
 
 # Initialize demo scenario
@@ -85,9 +124,14 @@ async def root():
 @app.get("/api/cameras")
 async def get_cameras():
     """Get all camera locations and status"""
+    # Camera list is static - serve the pre-serialized payload when available
+    cached = coordinator.get_all_cameras_json()
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    cameras = coordinator.get_all_cameras()
     return {
-        "cameras": coordinator.get_all_cameras(),
-        "count": len(coordinator.get_all_cameras())
+        "cameras": cameras,
+        "count": len(cameras)
     }
 
 @app.get("/api/threats")
@@ -147,7 +191,7 @@ async def toggle_ai_mode():
 @app.get("/api/video/analyze/{camera_id}")
 async def analyze_video_stream(camera_id: str):
     """Get real-time analysis annotations for a video stream"""
-    camera = next((c for c in coordinator.get_all_cameras() if c["id"] == camera_id), None)
+    camera = coordinator.get_camera(camera_id)
     if not camera or not camera.get("video"):
         return {"error": "Camera or video not found"}
     
@@ -187,8 +231,8 @@ async def analyze_video_stream(camera_id: str):
 async def video_analysis_stream(websocket: WebSocket, camera_id: str):
     """WebSocket stream for real-time video analysis with annotations"""
     await websocket.accept()
-    
-    camera = next((c for c in coordinator.get_all_cameras() if c["id"] == camera_id), None)
+
+    camera = coordinator.get_camera(camera_id)
     if not camera or not camera.get("video"):
         await websocket.close(code=1008, reason="Camera or video not found")
         return
@@ -224,44 +268,138 @@ async def video_analysis_stream(websocket: WebSocket, camera_id: str):
     
     try:
         import cv2
-        cap = cv2.VideoCapture(video_path)
+        import numpy as np
+        # Ask OpenCV's FFmpeg backend for hardware-accelerated decode when
+        # the build supports it - VIDEO_ACCELERATION_ANY picks whatever the
+        # platform offers (VAAPI, NVDEC, VideoToolbox) and falls back to
+        # software decode internally when no hw decoder matches the codec
+        cap = None
+        if hasattr(cv2, "CAP_PROP_HW_ACCELERATION"):
+            try:
+                cap = cv2.VideoCapture(
+                    video_path, cv2.CAP_FFMPEG,
+                    [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY]
+                )
+                if not cap.isOpened():
+                    cap.release()
+                    cap = None
+            except cv2.error:
+                cap = None
+        if cap is None:
+            cap = cv2.VideoCapture(video_path)
         fps = cap.get(cv2.CAP_PROP_FPS) or 30
         frame_delay = 1.0 / fps
-        
+        # Analyze at most VIDEO_ANALYSIS_FPS frames per second: grab()
+        # advances the stream without the decode + colorspace cost of
+        # read(), and skipped frames re-send the last annotations so the
+        # frontend overlay keeps updating at full rate
+        analyze_every = max(1, round(fps / VIDEO_ANALYSIS_FPS))
+
+        # Decode and analysis run as separate tasks joined by a small
+        # bounded queue, so the decoder works ahead while a frame is being
+        # analyzed instead of serializing decode -> analyze -> send
+        frame_queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+        _RESET = object()  # queued when the video loops back to the start
+
+        def queue_latest(item):
+            # Live semantics: when analysis falls behind, drop the oldest
+            # queued frame rather than blocking the decoder or building a
+            # latency backlog
+            if frame_queue.full():
+                try:
+                    frame_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    pass
+            frame_queue.put_nowait(item)
+
+        async def decode_frames():
+            # Producer: paces at source fps, decodes only sampled frames
+            # (grab() skips the rest) and hands them to the analysis loop.
+            # The blocking capture calls run on the default executor so
+            # other connections keep getting serviced
+            frame_index = 0
+            while True:
+                grabbed = await asyncio.to_thread(cap.grab)
+                if not grabbed:
+                    # Loop video
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                    queue_latest(_RESET)
+                    continue
+
+                frame_index += 1
+                if frame_index % analyze_every != 0:
+                    # Skipped frame: never decoded, annotations carried over
+                    queue_latest(None)
+                else:
+                    ret, frame = await asyncio.to_thread(cap.retrieve)
+                    if not ret:
+                        # Loop video
+                        cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                        queue_latest(_RESET)
+                        continue
+                    queue_latest((frame, int(cap.get(cv2.CAP_PROP_POS_FRAMES))))
+                await asyncio.sleep(frame_delay)
+
+        decode_task = asyncio.create_task(decode_frames())
+
         previous_frame = None
-        
+        last_payload = None
+        # Camera location is fixed - build the threat location dict once
+        # per connection instead of per detected frame
+        threat_location = {"lat": camera["lat"], "lng": camera["lng"]}
+
+        def analyze_one(frame):
+            # Full per-frame CPU pipeline: motion analysis, object
+            # detection (history is recorded inside _detect_objects) and
+            # combined wildlife/wildfire detection. Kept synchronous so the
+            # whole frame costs one executor handoff, not one per call
+            nonlocal previous_frame
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            motion_data = (
+                agent.video_analyzer._analyze_motion(gray, previous_frame)
+                if previous_frame is not None else (0.0, 0.0)
+            )
+            detected_objects = agent.video_analyzer._detect_objects(frame)
+            detection = agent.video_analyzer._detect_wildlife_activity_combined(
+                frame, gray, camera_id, previous_frame, detected_objects,
+                motion_data
+            )
+            # Reuse the reference buffer across frames rather than paying
+            # for a fresh gray.copy() allocation per analyzed frame
+            if previous_frame is None or previous_frame.shape != gray.shape:
+                previous_frame = gray.copy()
+            else:
+                np.copyto(previous_frame, gray)
+            return detection, detected_objects, motion_data
+
         while True:
-            ret, frame = cap.read()
-            if not ret:
-                # Loop video
-                cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            item = await frame_queue.get()
+            if item is _RESET:
                 previous_frame = None
                 continue
-            
-            # Analyze frame with full AI pipeline
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            motion_data = agent.video_analyzer._analyze_motion(gray, previous_frame) if previous_frame is not None else (0.0, 0.0)
-            
-            # Get object detections
-            detected_objects = agent.video_analyzer._detect_objects(frame)
-            
-            # Store object history for temporal analysis (loitering detection)
-            if detected_objects.get("count", 0) > 0:
-                agent.video_analyzer.object_history.append(detected_objects)
-                if len(agent.video_analyzer.object_history) > 30:  # Keep last 30 frames
-                    agent.video_analyzer.object_history.pop(0)
-            
-            # Run full suspicious activity detection (not just object detection)
-            detection = agent.video_analyzer._detect_suspicious_activity_combined(
-                gray, camera_id, previous_frame, detected_objects, motion_data
+            if item is None:
+                # Pacing tick for a skipped frame - re-send last annotations
+                if last_payload is not None:
+                    await send_json_fast(websocket, last_payload)
+                continue
+            frame, frame_number = item
+
+            # The blocking OpenCV/YOLO work runs on the default executor so
+            # the event loop keeps servicing other websocket clients
+            detection, detected_objects, motion_data = await asyncio.to_thread(
+                analyze_one, frame
             )
-            
-            previous_frame = gray.copy()
-            
+
+
+            # One timestamp per frame, shared by annotations and any threat
+            # broadcast - now_iso() is the coordinator's ~50ms-cached clock,
+            # so this does not even format a string on most frames
+            ts = coordinator.now_iso()
+
             # Format annotations for frontend
             annotations = {
-                "timestamp": datetime.now().isoformat(),
-                "frame_number": int(cap.get(cv2.CAP_PROP_POS_FRAMES)),
+                "timestamp": ts,
+                "frame_number": frame_number,
                 "objects": []
             }
             
@@ -276,12 +414,6 @@ async def video_analysis_stream(websocket: WebSocket, camera_id: str):
             
             # If threat detected, add to coordinator and broadcast to main WebSocket
             if detection:
-                # Get camera location for threat
-                threat_location = {
-                    "lat": camera["lat"],
-                    "lng": camera["lng"]
-                }
-                
                 # Add threat to coordinator
                 coordinator.add_threat({
                     "type": detection["activity_type"],
@@ -299,7 +431,7 @@ async def video_analysis_stream(websocket: WebSocket, camera_id: str):
                         "location": threat_location
                     },
                     "threat": {
-                        "id": str(uuid.uuid4()),
+                        "id": uuid.uuid4().hex,
                         "type": detection["activity_type"],
                         "camera_id": detection["camera_id"],
                         "location": threat_location,
@@ -309,11 +441,11 @@ async def video_analysis_stream(websocket: WebSocket, camera_id: str):
                         "details": detection.get("details", {})
                     },
                     "reasoning": agent.get_reasoning_log()[-1] if agent.get_reasoning_log() else None,
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": ts
                 })
             
             # Send annotations (always send, even if no threat)
-            await websocket.send_json({
+            last_payload = {
                 "type": "video_analysis",
                 "camera_id": camera_id,
                 "annotations": annotations,
@@ -324,13 +456,14 @@ async def video_analysis_stream(websocket: WebSocket, camera_id: str):
                 "threat_detected": detection is not None,
                 "threat_type": detection["activity_type"] if detection else None,
                 "threat_confidence": detection["confidence"] if detection else None
-            })
-            
-            await asyncio.sleep(frame_delay)
-            
+            }
+            await send_json_fast(websocket, last_payload)
+
     except Exception as e:
         print(f"Video analysis error: {e}")
     finally:
+        if 'decode_task' in locals():
+            decode_task.cancel()
         if 'cap' in locals():
             cap.release()
         await websocket.close()
@@ -376,11 +509,14 @@ async def twilio_voice_webhook(request: Request):
     
     # Get the most recent threat with analysis
     recent_threat = None
+    recent_analysis = None
     for threat in reversed(threats):
-        if threat.get("analysis"):
+        analysis = coordinator.get_threat_analysis(threat.get("id"))
+        if analysis:
             recent_threat = threat
+            recent_analysis = analysis
             break
-    
+
     if not recent_threat or not coordinator.twilio_service:
         from twilio.twiml.voice_response import VoiceResponse
         response = VoiceResponse()
@@ -393,7 +529,7 @@ async def twilio_voice_webhook(request: Request):
     # Generate voice response
     twiml = coordinator.twilio_service.generate_voice_response(
         recent_threat,
-        recent_threat.get("analysis", {}),
+        recent_analysis or {},
         nearby_cameras
     )
     
@@ -413,7 +549,7 @@ async def twilio_gather(request: Request):
         threats = coordinator.get_active_threats()
         if threats:
             recent_threat = threats[-1]
-            analysis = recent_threat.get("analysis", {})
+            analysis = coordinator.get_threat_analysis(recent_threat.get("id")) or {}
             summary = analysis.get("response_summary", "No additional information available.")
             response.say(summary, voice='alice')
         else: